@@ -1,48 +1,283 @@
 import math
 import random
+import time
+from concurrent.futures import ProcessPoolExecutor
 from config import *
+from perception import Perception
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def scan_food(heads, positions, values, chunk_elements=AI_FOOD_CHUNK_ELEMENTS):
+    targets = np.full(len(heads), -1, dtype=np.int64)
+    boost = np.zeros(len(heads), dtype=bool)
+    if len(heads) == 0 or len(positions) == 0:
+        return targets, boost
+    
+    vision_sq = AI_VISION_RANGE * AI_VISION_RANGE
+    boost_sq = AI_BOOST_FOOD_RANGE * AI_BOOST_FOOD_RANGE
+    reach = max(AI_VISION_RANGE, AI_BOOST_FOOD_RANGE)
+    
+    cells = np.floor(heads / AI_FOOD_SCAN_CELL_SIZE).astype(np.int64)
+    order = np.lexsort((cells[:, 1], cells[:, 0]))
+    ordered_cells = cells[order]
+    boundaries = np.flatnonzero((ordered_cells[1:] != ordered_cells[:-1]).any(axis=1)) + 1
+    
+    for group in np.split(order, boundaries):
+        group_heads = heads[group]
+        low = group_heads.min(axis=0) - reach
+        high = group_heads.max(axis=0) + reach
+        nearby = np.flatnonzero(((positions >= low) & (positions <= high)).all(axis=1))
+        if nearby.size == 0:
+            continue
+        
+        near_x = positions[nearby, 0]
+        near_y = positions[nearby, 1]
+        near_values = values[nearby]
+        base_scores = near_values * 50
+        boost_values = near_values >= AI_BOOST_FOOD_VALUE
+        
+        rows = max(1, chunk_elements // nearby.size)
+        for start in range(0, len(group), rows):
+            chunk = group[start:start + rows]
+            dx = heads[chunk, 0, None] - near_x
+            dy = heads[chunk, 1, None] - near_y
+            distance_sq = dx * dx + dy * dy
+            
+            visible = distance_sq < vision_sq
+            scores = np.where(visible, base_scores - np.sqrt(distance_sq), -np.inf)
+            choice = scores.argmax(axis=1)
+            found = visible[np.arange(len(chunk)), choice]
+            targets[chunk] = np.where(found, nearby[choice], -1)
+            boost[chunk] = ((distance_sq < boost_sq) & boost_values).any(axis=1)
+    
+    return targets, boost
+
+def decide_batch(seed, views):
+    ai = AI(None, random.Random(seed))
+    return [ai.target_angle(view) for view in views]
 
 class AI:
-    def __init__(self, game):
+    def __init__(self, game, rng=random):
         self.game = game
+        self.rng = rng
+        self.perception = Perception()
+        self.decision_slot = 0
+        self.decisions_made = 0
+        self.decisions_deferred = 0
+        self.pool = None
+        self.pending = []
+        self.tier_counts = {'near': 0, 'mid': 0, 'far': 0}
+        self.decision_interval = {
+            'near': AI_DECISION_RATE,
+            'mid': AI_DECISION_RATE * AI_LOD_MID_DECISION_SCALE,
+            'far': AI_DECISION_RATE * AI_LOD_FAR_DECISION_SCALE,
+        }
+    
+    def perceive(self, all_snakes, food_manager):
+        self.perception.update(all_snakes, food_manager)
+    
+    def next_decision_offset(self):
+        offset = self.decision_slot
+        self.decision_slot = (self.decision_slot + 1) % AI_DECISION_RATE
+        return offset
+    
+    def classify(self, all_snakes, player):
+        tier_counts = {'near': 0, 'mid': 0, 'far': 0}
+        controlled = []
+        
+        left = self.game.view_x if self.game is not None else 0
+        top = self.game.view_y if self.game is not None else 0
+        right = left + WINDOW_WIDTH
+        bottom = top + WINDOW_HEIGHT
+        
+        for snake in all_snakes:
+            if snake is player or not snake.alive:
+                continue
+            
+            tier = 'near'
+            if AI_LOD_ENABLED:
+                head_x, head_y = snake.get_head_position()
+                outside = max(left - head_x, head_x - right, top - head_y, head_y - bottom)
+                if outside > AI_LOD_MID_MARGIN:
+                    tier = 'far'
+                elif outside > AI_LOD_NEAR_MARGIN:
+                    tier = 'mid'
+            
+            tier_counts[tier] += 1
+            controlled.append((snake, tier))
+        
+        self.tier_counts = tier_counts
+        return controlled
     
-    def update_snake(self, snake, all_snakes, foods):
-        if not snake.alive:
+    def lod_stats(self):
+        return self.tier_counts
+    
+    def update(self, all_snakes, player):
+        self.decisions_made = 0
+        self.decisions_deferred = 0
+        
+        controlled = self.classify(all_snakes, player)
+        
+        if AI_WORKERS > 0:
+            self.update_pooled(controlled)
             return
+        
+        budget = AI_FRAME_BUDGET_MS
+        start = time.perf_counter()
+        
+        self.scan_food(controlled)
+        
+        for snake, tier in controlled:
+            snake.decision_counter += 1
+            if snake.decision_counter < self.decision_interval[tier]:
+                self.steer(snake)
+            elif (budget is not None and (time.perf_counter() - start) * 1000 > budget and
+                    not self.is_high_priority(snake)):
+                snake.deferred_ticks += 1
+                self.decisions_deferred += 1
+                self.steer(snake)
+            else:
+                snake.decision_counter = 0
+                snake.deferred_ticks = 0
+                self.decisions_made += 1
+                self.decide(snake, tier)
             
-        snake.decision_counter += 1
-        if snake.decision_counter < AI_DECISION_RATE:
-            angle_diff = snake.target_angle - snake.angle
-            if abs(angle_diff) > 0.1:
-                while angle_diff > math.pi:
-                    angle_diff -= 2 * math.pi
-                while angle_diff < -math.pi:
-                    angle_diff += 2 * math.pi
-                
-                turn_rate = 0.05
-                if angle_diff > 0:
-                    snake.angle += min(turn_rate, angle_diff)
+            if tier == 'far':
+                snake.toggle_boost(False)
+            else:
+                self.handle_ai_boost(snake)
+    
+    def update_pooled(self, controlled):
+        self.apply_pending()
+        self.scan_food(controlled)
+        
+        due = []
+        for snake, tier in controlled:
+            snake.decision_counter += 1
+            if snake.decision_counter >= self.decision_interval[tier]:
+                snake.decision_counter = 0
+                snake.deferred_ticks = 0
+                self.decisions_made += 1
+                if tier == 'far':
+                    self.decide(snake, tier)
                 else:
-                    snake.angle -= min(turn_rate, -angle_diff)
-                    
-            self.handle_ai_boost(snake, all_snakes, foods)
+                    if tier == 'mid':
+                        self.perception.view(snake).limit_neighbours(AI_LOD_MID_NEIGHBOURS)
+                    due.append(snake)
+            
+            self.steer(snake)
+            if tier == 'far':
+                snake.toggle_boost(False)
+            else:
+                self.handle_ai_boost(snake)
+        
+        if not due:
+            return
+        
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=AI_WORKERS)
+        
+        for i in range(0, len(due), AI_BATCH_SIZE):
+            batch = due[i:i + AI_BATCH_SIZE]
+            views = [self.perception.view(snake).freeze() for snake in batch]
+            future = self.pool.submit(decide_batch, self.rng.getrandbits(32), views)
+            generations = [snake.generation for snake in batch]
+            self.pending.append((batch, generations, future))
+    
+    def apply_pending(self):
+        for batch, generations, future in self.pending:
+            for snake, generation, angle in zip(batch, generations, future.result()):
+                if snake.alive and snake.generation == generation and angle is not None:
+                    snake.target_angle = angle
+        self.pending = []
+    
+    def discard_pending(self):
+        for _, _, future in self.pending:
+            future.cancel()
+        self.pending = []
+    
+    def close(self):
+        self.discard_pending()
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+    
+    def scan_food(self, controlled):
+        if np is None:
             return
         
-        snake.decision_counter = 0
-        head_x, head_y = snake.get_head_position()
+        views = [
+            self.perception.view(snake) for snake, tier in controlled
+            if snake.decision_counter + 1 >= self.decision_interval[tier] or
+            (tier != 'far' and len(snake.segments) > BOOST_MIN_LENGTH and snake.boost_cooldown <= 0)
+        ]
+        food_manager = self.perception.food_manager
+        count = len(food_manager.foods)
+        if len(views) * count < AI_FOOD_SCAN_MIN_PAIRS:
+            return
+        
+        positions = food_manager.positions[:count]
+        
+        heads = np.array([(view.x, view.y) for view in views])
+        targets, boost = scan_food(heads, positions, food_manager.values[:count])
+        
+        for view, target, boost_food in zip(views, targets.tolist(), boost.tolist()):
+            view.food_target = tuple(positions[target].tolist()) if target >= 0 else None
+            view.boost_food = boost_food
+    
+    def is_high_priority(self, snake):
+        if snake.deferred_ticks >= AI_MAX_DEFERRED_TICKS:
+            return True
+        
+        view = self.perception.view(snake)
+        center_x = self.game.view_x + WINDOW_WIDTH / 2
+        center_y = self.game.view_y + WINDOW_HEIGHT / 2
+        return (view.x - center_x)**2 + (view.y - center_y)**2 < AI_PRIORITY_RADIUS**2
+    
+    def decision_stats(self):
+        return self.decisions_made, self.decisions_deferred
+    
+    def steer(self, snake):
+        angle_diff = snake.target_angle - snake.angle
+        if abs(angle_diff) > 0.1:
+            while angle_diff > math.pi:
+                angle_diff -= 2 * math.pi
+            while angle_diff < -math.pi:
+                angle_diff += 2 * math.pi
+            
+            turn_rate = 0.05
+            if angle_diff > 0:
+                snake.angle += min(turn_rate, angle_diff)
+            else:
+                snake.angle -= min(turn_rate, -angle_diff)
+    
+    def decide(self, snake, tier='near'):
+        view = self.perception.view(snake)
+        if tier == 'mid':
+            view.limit_neighbours(AI_LOD_MID_NEIGHBOURS)
+        
+        angle = self.target_angle(view, tier)
+        if angle is not None:
+            snake.target_angle = angle
+    
+    def target_angle(self, view, tier='near'):
+        head_x, head_y = view.x, view.y
         
-        strategy = self.choose_strategy(snake, all_snakes, foods)
+        strategy = 'hunt_food' if tier == 'far' else self.choose_strategy(view)
         
         if strategy == 'hunt_food':
-            target_x, target_y = self.hunt_food_strategy(snake, foods)
+            target_x, target_y = self.hunt_food_strategy(view)
         elif strategy == 'attack':
-            target_x, target_y = self.attack_strategy(snake, all_snakes)
+            target_x, target_y = self.attack_strategy(view)
         elif strategy == 'encircle':
-            target_x, target_y = self.encircle_strategy(snake, all_snakes)
+            target_x, target_y = self.encircle_strategy(view)
         elif strategy == 'target_player':
-            target_x, target_y = self.target_player_strategy(snake, all_snakes)
+            target_x, target_y = self.target_player_strategy(view)
         else:
-            target_x, target_y = self.evasion_strategy(snake, all_snakes)
+            target_x, target_y = self.evasion_strategy(view)
         
         dx = target_x - head_x
         dy = target_y - head_y
@@ -50,213 +285,141 @@ class AI:
         if dx != 0 or dy != 0:
             base_angle = math.atan2(dy, dx)
             
-            randomness = 0.15 / (1 + len(snake.segments) * 0.01)
-            snake.target_angle = base_angle + random.uniform(-randomness, randomness)
+            randomness = 0.15 / (1 + view.size * 0.01)
+            return base_angle + self.rng.uniform(-randomness, randomness)
         
-        self.handle_ai_boost(snake, all_snakes, foods)
+        return None
 
-    def choose_strategy(self, snake, all_snakes, foods):
-        head_x, head_y = snake.get_head_position()
-        snake_size = len(snake.segments)
-        
-        player_snake = None
-        for other_snake in all_snakes:
-            if other_snake.is_player and other_snake.alive:
-                player_snake = other_snake
-                break
-        
-        if (player_snake and snake_size > 30 and 
-                random.random() < AI_TARGET_PLAYER_CHANCE):
-            player_head_x, player_head_y = player_snake.get_head_position()
-            distance_to_player = math.sqrt((head_x - player_head_x)**2 + (head_y - player_head_y)**2)
-            
-            if (distance_to_player < 400 and 
-                    len(snake.segments) > len(player_snake.segments) * 1.2):
+    def choose_strategy(self, view):
+        snake_size = view.size
+        player = view.player
+        
+        if (player and snake_size > 30 and 
+                self.rng.random() < AI_TARGET_PLAYER_CHANCE):
+            if player.distance < 400 and snake_size > player.size * 1.2:
                 return 'target_player'
         
-        nearby_snakes = []
-        for other_snake in all_snakes:
-            if other_snake is snake or not other_snake.alive:
-                continue
-                
-            other_head_x, other_head_y = other_snake.get_head_position()
-            distance = math.sqrt((head_x - other_head_x)**2 + (head_y - other_head_y)**2)
-            
-            if distance < 300:
-                nearby_snakes.append({
-                    'snake': other_snake,
-                    'distance': distance,
-                    'size': len(other_snake.segments)
-                })
-        
-        close_food = []
-        for food in foods:
-            distance = math.sqrt((head_x - food.x)**2 + (head_y - food.y)**2)
-            if distance < AI_VISION_RANGE:
-                close_food.append({
-                    'food': food,
-                    'distance': distance,
-                    'value': food.value
-                })
-        
-        if not nearby_snakes and close_food:
+        nearby_snakes = [other for other in view.neighbours if other.distance < 300]
+        
+        if not nearby_snakes and view.has_food():
             return 'hunt_food'
         
         if snake_size > 20:
-            smaller_nearby = [s for s in nearby_snakes if s['size'] < snake_size * 0.7]
+            smaller_nearby = [s for s in nearby_snakes if s.size < snake_size * 0.7]
             if smaller_nearby:
                 encircle_chance = min(0.7, snake_size / 100)
-                if random.random() < encircle_chance:
+                if self.rng.random() < encircle_chance:
                     return 'encircle'
                 else:
                     return 'attack'
         
-        bigger_nearby = [s for s in nearby_snakes if s['size'] > snake_size * 1.3]
+        bigger_nearby = [s for s in nearby_snakes if s.size > snake_size * 1.3]
         if bigger_nearby:
             return 'evade'
         
         return 'hunt_food'
 
-    def hunt_food_strategy(self, snake, foods):
-        head_x, head_y = snake.get_head_position()
+    def hunt_food_strategy(self, view):
+        head_x, head_y = view.x, view.y
         
-        best_food = None
-        best_score = float('-inf')
-        
-        for food in foods:
-            distance = math.sqrt((head_x - food.x)**2 + (head_y - food.y)**2)
-            if distance < AI_VISION_RANGE:
+        if view.food_target is not False:
+            if view.food_target is not None:
+                return view.food_target
+        else:
+            best_food = None
+            best_score = float('-inf')
+            
+            for food in view.food:
+                distance = math.sqrt((head_x - food.x)**2 + (head_y - food.y)**2)
                 score = food.value * 50 - distance
                 if score > best_score:
-                    best_score = food.value * 50 - distance
+                    best_score = score
                     best_food = food
-        
-        if best_food:
-            return best_food.x, best_food.y
+            
+            if best_food:
+                return best_food.x, best_food.y
             
         center_x = WORLD_WIDTH / 2
         center_y = WORLD_HEIGHT / 2
         
         wander_radius = 300
-        target_x = center_x + random.uniform(-wander_radius, wander_radius)
-        target_y = center_y + random.uniform(-wander_radius, wander_radius)
+        target_x = center_x + self.rng.uniform(-wander_radius, wander_radius)
+        target_y = center_y + self.rng.uniform(-wander_radius, wander_radius)
         
         return target_x, target_y
 
-    def attack_strategy(self, snake, all_snakes):
-        head_x, head_y = snake.get_head_position()
-        
+    def attack_strategy(self, view):
         best_target = None
         best_score = float('-inf')
         
-        for other_snake in all_snakes:
-            if other_snake is snake or not other_snake.alive:
+        for other in view.neighbours:
+            if other.size > view.size * 1.5 or other.size < 10:
                 continue
-                
-            other_size = len(other_snake.segments)
-            if other_size > len(snake.segments) * 1.5 or other_size < 10:
-                continue
-                
-            other_head_x, other_head_y = other_snake.get_head_position()
-            distance = math.sqrt((head_x - other_head_x)**2 + (head_y - other_head_y)**2)
             
-            if distance < 250 and distance > 50:
-                if len(other_snake.segments) > 1:
-                    dx = other_head_x - other_snake.segments[1][0]
-                    dy = other_head_y - other_snake.segments[1][1]
-                    if dx != 0 or dy != 0:
-                        score = 300 - distance - other_size * 0.5
-                        if score > best_score:
-                            best_score = score
-                            best_target = other_snake
+            if other.distance < 250 and other.distance > 50:
+                if other.heading is not None and other.heading != (0, 0):
+                    score = 300 - other.distance - other.size * 0.5
+                    if score > best_score:
+                        best_score = score
+                        best_target = other
         
         if best_target:
-            target_head_x, target_head_y = best_target.get_head_position()
-            if len(best_target.segments) > 1:
-                dx = target_head_x - best_target.segments[1][0]
-                dy = target_head_y - best_target.segments[1][1]
-                
-                length = math.sqrt(dx*dx + dy*dy)
-                if length > 0:
-                    dx /= length
-                    dy /= length
-                    
-                    intercept_distance = 50 + random.uniform(0, 30)
-                    target_x = target_head_x + dx * intercept_distance
-                    target_y = target_head_y + dy * intercept_distance
-                    
-                    return target_x, target_y
+            dx, dy = best_target.heading
+            
+            length = math.sqrt(dx*dx + dy*dy)
+            dx /= length
+            dy /= length
+            
+            intercept_distance = 50 + self.rng.uniform(0, 30)
+            target_x = best_target.x + dx * intercept_distance
+            target_y = best_target.y + dy * intercept_distance
+            
+            return target_x, target_y
         
-        return self.hunt_food_strategy(snake, self.game.food_manager.foods)
+        return self.hunt_food_strategy(view)
 
-    def encircle_strategy(self, snake, all_snakes):
-        head_x, head_y = snake.get_head_position()
-        
+    def encircle_strategy(self, view):
         best_target = None
         best_score = float('-inf')
         
-        for other_snake in all_snakes:
-            if other_snake is snake or not other_snake.alive:
+        for other in view.neighbours:
+            if other.size > view.size * 0.5 or other.size < 5:
                 continue
-                
-            other_size = len(other_snake.segments)
-            if other_size > len(snake.segments) * 0.5 or other_size < 5:
-                continue
-                
-            other_head_x, other_head_y = other_snake.get_head_position()
-            distance = math.sqrt((head_x - other_head_x)**2 + (head_y - other_head_y)**2)
             
-            if distance < 200:
-                score = 250 - distance - other_size
+            if other.distance < 200:
+                score = 250 - other.distance - other.size
                 if score > best_score:
                     best_score = score
-                    best_target = other_snake
+                    best_target = other
         
         if best_target:
-            target_head_x, target_head_y = best_target.get_head_position()
+            circle_radius = 60 + self.rng.uniform(-10, 10)
             
-            circle_radius = 60 + random.uniform(-10, 10)
-            
-            angle_to_target = math.atan2(target_head_y - head_y, target_head_x - head_x)
+            angle_to_target = math.atan2(best_target.y - view.y, best_target.x - view.x)
             
             circle_offset = math.pi / 2
             
-            target_x = target_head_x + math.cos(angle_to_target + circle_offset) * circle_radius
-            target_y = target_head_y + math.sin(angle_to_target + circle_offset) * circle_radius
+            target_x = best_target.x + math.cos(angle_to_target + circle_offset) * circle_radius
+            target_y = best_target.y + math.sin(angle_to_target + circle_offset) * circle_radius
             
             return target_x, target_y
         
-        return self.hunt_food_strategy(snake, self.game.food_manager.foods)
+        return self.hunt_food_strategy(view)
 
-    def evasion_strategy(self, snake, all_snakes):
-        head_x, head_y = snake.get_head_position()
+    def evasion_strategy(self, view):
+        head_x, head_y = view.x, view.y
         
-        threats = []
-        for other_snake in all_snakes:
-            if other_snake is snake or not other_snake.alive:
-                continue
-                
-            other_head_x, other_head_y = other_snake.get_head_position()
-            distance = math.sqrt((head_x - other_head_x)**2 + (head_y - other_head_y)**2)
-            
-            is_larger = len(other_snake.segments) > len(snake.segments)
-            if distance < 200 and is_larger:
-                threats.append({
-                    'x': other_head_x,
-                    'y': other_head_y,
-                    'distance': distance,
-                    'size': len(other_snake.segments)
-                })
+        threats = [other for other in view.neighbours if other.distance < 200 and other.size > view.size]
         
         if threats:
             evade_x, evade_y = 0, 0
             
             for threat in threats:
-                dx = head_x - threat['x']
-                dy = head_y - threat['y']
+                dx = head_x - threat.x
+                dy = head_y - threat.y
                 
-                distance = max(0.1, threat['distance'])
-                threat_level = (200 / distance) * (threat['size'] / max(1, len(snake.segments)))
+                distance = max(0.1, threat.distance)
+                threat_level = (200 / distance) * (threat.size / max(1, view.size))
                 
                 if distance > 0:
                     evade_x += (dx / distance) * threat_level
@@ -284,100 +447,72 @@ class AI:
                     
                 return target_x, target_y
         
-        return self.hunt_food_strategy(snake, self.game.food_manager.foods)
+        return self.hunt_food_strategy(view)
 
-    def target_player_strategy(self, snake, all_snakes):
-        head_x, head_y = snake.get_head_position()
+    def target_player_strategy(self, view):
+        player = view.player
         
-        for other_snake in all_snakes:
-            if other_snake.is_player and other_snake.alive:
-                player_snake = other_snake
-                player_head_x, player_head_y = player_snake.get_head_position()
+        if player:
+            if player.distance >= 300:
+                return player.x, player.y
+            
+            if player.heading is not None:
+                player_dx, player_dy = player.heading
                 
-                distance = math.sqrt((head_x - player_head_x)**2 + (head_y - player_head_y)**2)
+                magnitude = math.sqrt(player_dx**2 + player_dy**2)
+                if magnitude > 0:
+                    player_dx /= magnitude
+                    player_dy /= magnitude
                 
-                if distance < 300:
-                    if len(player_snake.segments) > 1:
-                        player_dx = player_head_x - player_snake.segments[1][0]
-                        player_dy = player_head_y - player_snake.segments[1][1]
-                        
-                        magnitude = math.sqrt(player_dx**2 + player_dy**2)
-                        if magnitude > 0:
-                            player_dx /= magnitude
-                            player_dy /= magnitude
-                        
-                        intercept_distance = min(200, distance * 0.5)
-                        
-                        intercept_x = player_head_x + player_dx * intercept_distance
-                        intercept_y = player_head_y + player_dy * intercept_distance
-                        
-                        jitter = 30 * random.uniform(-1, 1)
-                        intercept_x += jitter
-                        intercept_y += jitter
-                        
-                        return intercept_x, intercept_y
-                        
-                else:
-                    return player_head_x, player_head_y
+                intercept_distance = min(200, player.distance * 0.5)
+                
+                intercept_x = player.x + player_dx * intercept_distance
+                intercept_y = player.y + player_dy * intercept_distance
+                
+                jitter = 30 * self.rng.uniform(-1, 1)
+                intercept_x += jitter
+                intercept_y += jitter
+                
+                return intercept_x, intercept_y
         
-        return self.hunt_food_strategy(snake, self.game.food_manager.foods)
+        return self.hunt_food_strategy(view)
 
-    def handle_ai_boost(self, snake, all_snakes, foods):
+    def handle_ai_boost(self, snake):
         if len(snake.segments) <= BOOST_MIN_LENGTH or snake.boost_cooldown > 0:
             snake.toggle_boost(False)
             return
         
-        head_x, head_y = snake.get_head_position()
+        view = self.perception.view(snake)
         
-        for food in foods:
-            distance = math.sqrt((head_x - food.x)**2 + (head_y - food.y)**2)
-            if distance < 150 and food.value >= 3:
-                snake.toggle_boost(True)
-                return
+        if view.has_boost_food():
+            snake.toggle_boost(True)
+            return
         
-        for other_snake in all_snakes:
-            if other_snake is snake or not other_snake.alive:
-                continue
+        for other in view.neighbours:
+            if other.size > view.size and other.distance < 100 and other.heading is not None:
+                other_dir_x, other_dir_y = other.heading
                 
-            if len(other_snake.segments) > len(snake.segments):
-                other_head_x, other_head_y = other_snake.get_head_position()
-                distance = math.sqrt((head_x - other_head_x)**2 + (head_y - other_head_y)**2)
+                to_us_x = view.x - other.x
+                to_us_y = view.y - other.y
                 
-                if distance < 100:
-                    if len(other_snake.segments) > 1:
-                        other_dir_x = other_head_x - other_snake.segments[1][0]
-                        other_dir_y = other_head_y - other_snake.segments[1][1]
-                        
-                        to_us_x = head_x - other_head_x
-                        to_us_y = head_y - other_head_y
-                        
-                        dot_product = other_dir_x * to_us_x + other_dir_y * to_us_y
-                        
-                        if dot_product > 0:
-                            snake.toggle_boost(True)
-                            return
-        
-        for other_snake in all_snakes:
-            if other_snake is snake or not other_snake.alive:
-                continue
+                dot_product = other_dir_x * to_us_x + other_dir_y * to_us_y
+                
+                if dot_product > 0:
+                    snake.toggle_boost(True)
+                    return
+        
+        for other in view.neighbours:
+            if other.size < view.size * 0.7 and other.distance < 120 and view.heading is not None:
+                our_dir_x, our_dir_y = view.heading
+                
+                to_other_x = other.x - view.x
+                to_other_y = other.y - view.y
                 
-            if len(other_snake.segments) < len(snake.segments) * 0.7:
-                other_head_x, other_head_y = other_snake.get_head_position()
-                distance = math.sqrt((head_x - other_head_x)**2 + (head_y - other_head_y)**2)
+                dot_product = our_dir_x * to_other_x + our_dir_y * to_other_y
                 
-                if distance < 120:
-                    if len(snake.segments) > 1:
-                        our_dir_x = head_x - snake.segments[1][0]
-                        our_dir_y = head_y - snake.segments[1][1]
-                        
-                        to_other_x = other_head_x - head_x
-                        to_other_y = other_head_y - head_y
-                        
-                        dot_product = our_dir_x * to_other_x + our_dir_y * to_other_y
-                        
-                        if dot_product > 0:
-                            if random.random() < AI_AGGRESSION_FACTOR * 0.7:
-                                snake.toggle_boost(True)
-                                return
+                if dot_product > 0:
+                    if self.rng.random() < AI_AGGRESSION_FACTOR * 0.7:
+                        snake.toggle_boost(True)
+                        return
         
         snake.toggle_boost(False)
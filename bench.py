@@ -0,0 +1,197 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import contextlib
+import io
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from config import *
+from engine import Engine, PHASES
+from world import VECTORIZE_AVAILABLE
+
+SCENARIOS = {
+    "ai_15": {"snakes": 15},
+    "ai_100": {"snakes": 100},
+    "ai_500": {"snakes": 500, "ticks": 150},
+    "food_200": {"snakes": 15, "food": 200},
+    "food_5k": {"snakes": 15, "food": 5000},
+    "food_50k": {"snakes": 15, "food": 50000, "ticks": 150},
+    "long_snakes": {"snakes": 40, "length": 400},
+    "mass_death": {"snakes": 200, "kill_every": 60, "kill_fraction": 0.75},
+}
+
+DEFAULT_TICKS = 300
+WARMUP_TICKS = 20
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(seconds):
+    millis = [value * 1000 for value in seconds]
+    return {
+        "mean": sum(millis) / len(millis),
+        "p50": percentile(millis, 0.5),
+        "p99": percentile(millis, 0.99),
+    }
+
+
+def kill_fraction(engine, fraction):
+    victims = [snake for snake in engine.snakes if snake.alive and snake is not engine.player]
+    victims = victims[:int(len(victims) * fraction)]
+    for snake in victims:
+        head_x, head_y = snake.get_head_position()
+        engine.particle_system.add_explosion(head_x, head_y, snake.color)
+        for food_x, food_y, value in snake.die():
+            engine.food_manager.add_food_at_position(food_x, food_y, value)
+
+
+def setup_scenario(engine, scenario):
+    engine.reset(with_player=False, num_ai_snakes=scenario["snakes"], respawn_floor=scenario["snakes"])
+
+    food = scenario.get("food")
+    if food is not None:
+        engine.food_manager.max_items = food
+        engine.food_manager.populate(food)
+
+    length = scenario.get("length")
+    if length is not None:
+        for snake in engine.snakes:
+            snake.grow(max(0, length - len(snake.segments)))
+
+    engine.set_view(WORLD_WIDTH // 2 - WINDOW_WIDTH // 2, WORLD_HEIGHT // 2 - WINDOW_HEIGHT // 2)
+
+
+def run_scenario(name, scenario, seed, ticks=None, warmup=WARMUP_TICKS):
+    ticks = ticks or scenario.get("ticks", DEFAULT_TICKS)
+    kill_every = scenario.get("kill_every")
+
+    engine = Engine(seed=seed)
+    try:
+        setup_scenario(engine, scenario)
+
+        tick_times = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for tick in range(warmup + ticks):
+                if tick == warmup:
+                    engine.enable_profiling()
+                start = time.perf_counter()
+                if kill_every and tick % kill_every == kill_every - 1:
+                    kill_fraction(engine, scenario["kill_fraction"])
+                engine.update()
+                if tick >= warmup:
+                    tick_times.append(time.perf_counter() - start)
+
+        total = sum(tick_times)
+        return {
+            "ticks": ticks,
+            "ticks_per_second": ticks / total if total > 0 else 0.0,
+            "tick_ms": summarize(tick_times),
+            "phases_ms": {phase: summarize(engine.phase_times[phase]) for phase in PHASES},
+            "snakes_alive": sum(1 for snake in engine.snakes if snake.alive),
+            "food": len(engine.food_manager.foods),
+            "digest": engine.state_digest()[:16],
+        }
+    finally:
+        engine.close()
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "vectorized": ENGINE_VECTORIZED and VECTORIZE_AVAILABLE,
+        "ai_workers": AI_WORKERS,
+    }
+
+
+def print_result(name, result):
+    tick = result["tick_ms"]
+    print(f"{name:<12} {tick['mean']:8.2f} {tick['p50']:8.2f} {tick['p99']:8.2f} {result['ticks_per_second']:9.1f}  "
+          + " ".join(f"{phase}={result['phases_ms'][phase]['mean']:.2f}" for phase in PHASES))
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    print()
+    print(f"{'scenario':<12} {'base':>8} {'now':>8} {'change':>8}")
+    for name, result in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            print(f"{name:<12} {'-':>8} {result['tick_ms']['mean']:8.2f}      new")
+            continue
+
+        before = base["tick_ms"]["mean"]
+        after = result["tick_ms"]["mean"]
+        change = (after - before) / before if before > 0 else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "REGRESSION"
+            regressions.append(name)
+        if base.get("digest") != result["digest"]:
+            flag = (flag + " (different world state)").strip()
+        print(f"{name:<12} {before:8.2f} {after:8.2f} {change * 100:+7.1f}% {flag}")
+
+        for phase in PHASES:
+            phase_before = base["phases_ms"].get(phase, {}).get("mean")
+            phase_after = result["phases_ms"][phase]["mean"]
+            if phase_before:
+                print(f"  {phase:<10} {phase_before:8.2f} {phase_after:8.2f} {(phase_after - phase_before) / phase_before * 100:+7.1f}%")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless simulation benchmarks")
+    parser.add_argument("scenarios", nargs="*", help="scenarios to run (default: all)")
+    parser.add_argument("--list", action="store_true", help="list scenarios and exit")
+    parser.add_argument("--ticks", type=int, help="override measured ticks per scenario")
+    parser.add_argument("--warmup", type=int, default=WARMUP_TICKS)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="bench.json", help="where to write results")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown of mean tick time")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, scenario in SCENARIOS.items():
+            print(name, scenario)
+        return 0
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+
+    results = {"seed": args.seed, "environment": environment(), "scenarios": {}}
+    print(f"{'scenario':<12} {'mean ms':>8} {'p50 ms':>8} {'p99 ms':>8} {'ticks/s':>9}  phase means (ms)")
+    for name in names:
+        result = run_scenario(name, SCENARIOS[name], args.seed, args.ticks, args.warmup)
+        results["scenarios"][name] = result
+        print_result(name, result)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nSlower than baseline by more than {args.threshold * 100:.0f}%: {', '.join(regressions)}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+from config import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def find_contacts(snakes, grid):
+    index = {snake: i for i, snake in enumerate(snakes)}
+
+    head_ids = []
+    body_ids = []
+    offsets_x = []
+    offsets_y = []
+    limits = []
+
+    for i, snake in enumerate(snakes):
+        if not snake.alive:
+            continue
+
+        reach = snake.head_radius + SEGMENT_RADIUS - COLLISION_BUFFER
+        if reach <= 0:
+            continue
+
+        check_self = (ENABLE_SELF_COLLISION and not snake.collision_immune and
+                      len(snake.segments) > SELF_COLLISION_START_INDEX)
+        self_limit = snake.head_radius - COLLISION_BUFFER
+
+        head_x, head_y = snake.get_head_position()
+        for owner, seq, x, y in grid.query(head_x, head_y, reach):
+            if owner is snake:
+                if not check_self or snake.head_seq - seq < SELF_COLLISION_START_INDEX:
+                    continue
+                limit = self_limit
+            else:
+                limit = snake.head_radius + owner.segment_radius - COLLISION_BUFFER
+
+            if limit <= 0:
+                continue
+
+            head_ids.append(i)
+            body_ids.append(index[owner])
+            offsets_x.append(x - head_x)
+            offsets_y.append(y - head_y)
+            limits.append(limit)
+
+    if not head_ids:
+        return []
+
+    if np is not None:
+        offsets_x = np.array(offsets_x)
+        offsets_y = np.array(offsets_y)
+        limits = np.array(limits)
+        touching = offsets_x * offsets_x + offsets_y * offsets_y < limits * limits
+        contacts = zip(np.array(head_ids)[touching].tolist(), np.array(body_ids)[touching].tolist())
+    else:
+        contacts = [
+            (i, j) for i, j, dx, dy, limit in zip(head_ids, body_ids, offsets_x, offsets_y, limits)
+            if dx * dx + dy * dy < limit * limit
+        ]
+
+    return sorted(set(contacts))
+
+
+def resolve_kills(contacts):
+    hits = {}
+    for victim, other in contacts:
+        hits.setdefault(victim, []).append(other)
+
+    kills = []
+    dead = set()
+    for victim in sorted(hits):
+        others = hits[victim]
+        if victim in others:
+            kills.append((victim, None))
+            dead.add(victim)
+            continue
+
+        for other in others:
+            if other not in dead:
+                kills.append((victim, other))
+                dead.add(victim)
+                break
+
+    return kills
@@ -27,15 +27,24 @@ GRID_COLOR = (25, 35, 45)
 
 GRID_SIZE = 40
 INITIAL_SNAKE_LENGTH = 5
+HEAD_RADIUS = 10
+SEGMENT_RADIUS = 8
+SEGMENT_CHUNK_SIZE = 32
 
 
 PLAYER_SPEED = 5
 AI_SPEED = 4
 
+ENGINE_VECTORIZED = False
+
 
 
 FOOD_SPAWN_RATE = 0.05
 MAX_FOOD_ITEMS = 200
+FOOD_GRID_CELL_SIZE = 64
+FOOD_SPRITE_CACHE_SIZE = 2048
+FOOD_PULSE_STEPS = 8
+FOOD_ROTATION_STEPS = 24
 GROWTH_PER_FOOD = 2
 SCORE_FONT_SIZE = 24
 BOUNDARY_WIDTH = 8
@@ -46,6 +55,7 @@ DROPPED_FOOD_COUNT = 10
 COLLISION_BUFFER = 0
 SELF_COLLISION_START_INDEX = 8
 OTHER_COLLISION_BUFFER = 0
+COLLISION_IMMUNE_TICKS = int(0.5 * FPS)
 
 BOOST_SPEED_MULTIPLIER = 1.8
 BOOST_SEGMENT_DROP_INTERVAL = 6
@@ -53,6 +63,7 @@ BOOST_MIN_LENGTH = 8
 BOOST_COOLDOWN = 1.5
 BOOST_FOOD_SIZE = 1
 BOOST_EFFECT_QUALITY = 3
+BOOST_TRAIL_SEGMENTS = 25
 BOOST_LENGTH_COST = 2
 BOOST_SCORE_REDUCTION = True
 
@@ -87,6 +98,7 @@ SCOREBOARD_ENTRIES = 10
 MINIMAP_SIZE = 180
 MINIMAP_POSITION = (20, 20)
 MINIMAP_OPACITY = 160
+MINIMAP_UPDATE_RATE = 10
 MENU_BACKGROUND_COLOR = (8, 12, 20)
 MENU_ACCENT_COLOR = (90, 140, 230)
 BUTTON_COLOR = (30, 45, 80)
@@ -100,6 +112,7 @@ UI_HOVER_EFFECT = True
 UI_BUTTON_SOUND = False
 BUTTON_HOVER_ANIMATION_SPEED = 0.2
 UI_FONT = "Arial"
+TEXT_CACHE_SIZE = 256
 
 SHOW_SNAKE_STATS = True
 CUSTOM_FONTS = True
@@ -116,6 +129,9 @@ GLOW_INTENSITY = 3.0
 MAP_DESIGN_STYLE = "modern"
 BACKGROUND_PATTERN_STYLE = "dots"
 MAP_DECORATION_DENSITY = 30
+BACKGROUND_TILE_SIZE = 400
+BACKGROUND_PATTERN_SEED = 1337
+SESSION_SEED = None
 
 COOLDOWN_BAR_COLOR = (100, 180, 255)
 COOLDOWN_BAR_BG_COLOR = (60, 60, 70)
@@ -130,12 +146,17 @@ DEATH_EXPLOSION_PARTICLES = 50
 PATTERN_DENSITY = 30
 
 PARTICLE_MAX_COUNT = 300
+PARTICLE_STAMP_CACHE_SIZE = 4096
+PARTICLE_COLOR_QUANTUM = 8
+PARTICLE_ALPHA_QUANTUM = 16
 FOOD_SPARKLE_COLOR = (255, 255, 100)
 FLOATING_TEXT_DURATION = 1.0
 DEATH_EXPLOSION_SIZE = 20
 
 DEBUG_MODE = False
 FPS_DISPLAY = True
+RENDER_MODE = "flip"
+DIRTY_RECT_FLIP_RATIO = 0.5
 SHOW_COLLISION_BOXES = False
 
 GROWTH_RATE_SCALING = 1.0
@@ -149,7 +170,24 @@ EXIT_KEYS = [pygame.K_ESCAPE]
 
 NUM_AI_SNAKES = 15
 AI_VISION_RANGE = 200
+AI_PERCEPTION_RADIUS = 300
+AI_FOOD_CHUNK_ELEMENTS = 1 << 16
+AI_FOOD_SCAN_CELL_SIZE = 800
+AI_FOOD_SCAN_MIN_PAIRS = 20000
+AI_BOOST_FOOD_RANGE = 150
+AI_BOOST_FOOD_VALUE = 3
 AI_DECISION_RATE = 10
+AI_FRAME_BUDGET_MS = None
+AI_PRIORITY_RADIUS = 600
+AI_MAX_DEFERRED_TICKS = 5
+AI_WORKERS = 0
+AI_BATCH_SIZE = 32
+AI_LOD_ENABLED = True
+AI_LOD_NEAR_MARGIN = 300
+AI_LOD_MID_MARGIN = 1200
+AI_LOD_MID_DECISION_SCALE = 2
+AI_LOD_FAR_DECISION_SCALE = 4
+AI_LOD_MID_NEIGHBOURS = 4
 AI_AGGRESSION_FACTOR = 0.85
 AI_TARGET_PLAYER_CHANCE = 0.3
 AI_BOOST_AGGRESSIVENESS = 0.7
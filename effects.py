@@ -1,7 +1,44 @@
 import pygame
 import random
 import math
+from collections import OrderedDict
 from config import *
+from fonts import render_text
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def stamp_key(radius, r, g, b, alpha):
+    r -= r % PARTICLE_COLOR_QUANTUM
+    g -= g % PARTICLE_COLOR_QUANTUM
+    b -= b % PARTICLE_COLOR_QUANTUM
+    alpha -= alpha % PARTICLE_ALPHA_QUANTUM
+    return (radius << 32) | (r << 24) | (g << 16) | (b << 8) | alpha
+
+class ParticleStampCache:
+    def __init__(self, max_size=PARTICLE_STAMP_CACHE_SIZE):
+        self.max_size = max_size
+        self.stamps = OrderedDict()
+    
+    def get(self, key):
+        stamp = self.stamps.get(key)
+        if stamp is not None:
+            self.stamps.move_to_end(key)
+            return stamp
+        
+        radius = key >> 32
+        color = ((key >> 24) & 255, (key >> 16) & 255, (key >> 8) & 255, key & 255)
+        stamp = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
+        pygame.draw.circle(stamp, color, (radius, radius), radius)
+        
+        self.stamps[key] = stamp
+        if len(self.stamps) > self.max_size:
+            self.stamps.popitem(last=False)
+        return stamp
+
+particle_stamps = ParticleStampCache()
 
 class Particle:
     def __init__(self, x, y, vel_x, vel_y, size, color, life, gravity=0):
@@ -33,41 +70,33 @@ class Particle:
         
         self.size = self.original_size * (self.life / self.max_life)
         
-    def draw(self, surface, camera_x, camera_y):
+    def blit_item(self, camera_x, camera_y):
         screen_x = int(self.x - camera_x)
         screen_y = int(self.y - camera_y)
         
         if (screen_x < -self.size or screen_x > WINDOW_WIDTH + self.size or
             screen_y < -self.size or screen_y > WINDOW_HEIGHT + self.size):
-            return
+            return None
             
-        alpha = int(255 * (self.life / self.max_life))
-        
+        alpha = max(0, min(255, int(255 * (self.life / self.max_life))))
         size = max(1, int(self.size))
-        particle_surface = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
         
-        try:
-            particle_color = (
-                self.color[0],
-                self.color[1],
-                self.color[2],
-                alpha
-            )
-            pygame.draw.circle(
-                particle_surface, 
-                particle_color,
-                (size, size), 
-                size
-            )
-            
-            surface.blit(particle_surface, (screen_x - size, screen_y - size))
-        except (ValueError, TypeError) as e:
-            pass
+        stamp = particle_stamps.get(stamp_key(size, self.color[0], self.color[1], self.color[2], alpha))
+        return stamp, (screen_x - size, screen_y - size)
+    
+    def draw(self, surface, camera_x, camera_y):
+        item = self.blit_item(camera_x, camera_y)
+        if item is not None:
+            surface.blit(*item)
 
 class ParticleSystem:
-    def __init__(self):
+    def __init__(self, rng=random):
+        self.rng = rng
         self.particles = []
     
+    def __len__(self):
+        return len(self.particles)
+    
     def update(self, dt):
         i = 0
         while i < len(self.particles):
@@ -82,15 +111,16 @@ class ParticleSystem:
             self.particles = self.particles[-PARTICLE_MAX_COUNT:]
     
     def draw(self, surface, camera_x, camera_y):
+        batch = []
         for particle in self.particles:
-            try:
-                particle.draw(surface, camera_x, camera_y)
-            except Exception:
-                if particle in self.particles:
-                    self.particles.remove(particle)
+            item = particle.blit_item(camera_x, camera_y)
+            if item is not None:
+                batch.append(item)
+        return surface.blits(batch)
     
     def add_explosion(self, x, y, color):
         try:
+            rng = self.rng
             if color is None:
                 color = (220, 100, 100)
             
@@ -105,19 +135,19 @@ class ParticleSystem:
             )
                 
             for _ in range(DEATH_EXPLOSION_SIZE):
-                angle = random.uniform(0, math.pi * 2)
-                speed = random.uniform(2, 7)
+                angle = rng.uniform(0, math.pi * 2)
+                speed = rng.uniform(2, 7)
                 
                 vel_x = math.cos(angle) * speed
                 vel_y = math.sin(angle) * speed
                 
-                size = random.uniform(3, 10)
-                life = random.uniform(0.5, 1.3)
+                size = rng.uniform(3, 10)
+                life = rng.uniform(0.5, 1.3)
                 
                 r, g, b = softened_color
-                r = min(255, max(0, r + random.randint(-15, 15)))
-                g = min(255, max(0, g + random.randint(-15, 15)))
-                b = min(255, max(0, b + random.randint(-15, 15)))
+                r = min(255, max(0, r + rng.randint(-15, 15)))
+                g = min(255, max(0, g + rng.randint(-15, 15)))
+                b = min(255, max(0, b + rng.randint(-15, 15)))
                 
                 self.particles.append(
                     Particle(x, y, vel_x, vel_y, size, (r, g, b), life, gravity=0.1)
@@ -127,6 +157,7 @@ class ParticleSystem:
     
     def add_food_sparkle(self, x, y, color):
         try:
+            rng = self.rng
             if color is None:
                 color = (220, 220, 100)
             
@@ -141,14 +172,14 @@ class ParticleSystem:
             )
             
             for _ in range(6):
-                angle = random.uniform(0, math.pi * 2)
-                speed = random.uniform(0.8, 2.5)
+                angle = rng.uniform(0, math.pi * 2)
+                speed = rng.uniform(0.8, 2.5)
                 
                 vel_x = math.cos(angle) * speed
                 vel_y = math.sin(angle) * speed
                 
-                size = random.uniform(1.5, 4)
-                life = random.uniform(0.2, 0.6)
+                size = rng.uniform(1.5, 4)
+                life = rng.uniform(0.2, 0.6)
                 
                 self.particles.append(
                     Particle(x, y, vel_x, vel_y, size, bright_color, life)
@@ -156,6 +187,164 @@ class ParticleSystem:
         except Exception:
             pass
 
+class ArrayParticleSystem:
+    FIELDS = ("x", "y", "vel_x", "vel_y", "size", "original_size", "life", "max_life", "gravity")
+    
+    def __init__(self, capacity=PARTICLE_MAX_COUNT, rng=random):
+        self.capacity = capacity
+        self.count = 0
+        self.drag = 0.98
+        self.rng = np.random.default_rng(rng.getrandbits(64))
+        
+        for name in self.FIELDS:
+            setattr(self, name, np.zeros(capacity))
+        self.color = np.zeros((capacity, 3), dtype=np.int16)
+    
+    def __len__(self):
+        return self.count
+    
+    def _arrays(self):
+        return [getattr(self, name) for name in self.FIELDS] + [self.color]
+    
+    def _reserve(self, amount):
+        overflow = self.count + amount - self.capacity
+        if overflow > 0:
+            keep = self.count - overflow
+            for array in self._arrays():
+                array[:keep] = array[overflow:self.count]
+            self.count = keep
+        start = self.count
+        self.count += amount
+        return start
+    
+    def emit(self, x, y, vel_x, vel_y, size, color, life, gravity=0):
+        skip = max(0, len(vel_x) - self.capacity)
+        amount = len(vel_x) - skip
+        if amount <= 0:
+            return
+        
+        start = self._reserve(amount)
+        end = start + amount
+        
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vel_x[start:end] = vel_x[skip:]
+        self.vel_y[start:end] = vel_y[skip:]
+        self.size[start:end] = size[skip:]
+        self.original_size[start:end] = size[skip:]
+        self.life[start:end] = life[skip:]
+        self.max_life[start:end] = life[skip:]
+        self.gravity[start:end] = gravity
+        self.color[start:end] = np.clip(np.broadcast_to(color, (amount + skip, 3))[skip:], 0, 255)
+    
+    def update(self, dt):
+        n = self.count
+        if n == 0:
+            return
+        
+        vel_x = self.vel_x[:n]
+        vel_y = self.vel_y[:n]
+        
+        vel_y += self.gravity[:n] * dt
+        vel_x *= self.drag
+        vel_y *= self.drag
+        
+        self.x[:n] += vel_x * dt * 60
+        self.y[:n] += vel_y * dt * 60
+        
+        life = self.life[:n]
+        life -= dt
+        self.size[:n] = self.original_size[:n] * (life / self.max_life[:n])
+        
+        alive = life > 0
+        keep = int(np.count_nonzero(alive))
+        if keep < n:
+            for array in self._arrays():
+                array[:keep] = array[:n][alive]
+            self.count = keep
+    
+    def draw(self, surface, camera_x, camera_y):
+        n = self.count
+        if n == 0:
+            return []
+        
+        size = self.size[:n]
+        screen_x = (self.x[:n] - camera_x).astype(np.int64)
+        screen_y = (self.y[:n] - camera_y).astype(np.int64)
+        visible = np.flatnonzero(
+            (screen_x >= -size) & (screen_x <= WINDOW_WIDTH + size) &
+            (screen_y >= -size) & (screen_y <= WINDOW_HEIGHT + size)
+        )
+        if visible.size == 0:
+            return []
+        
+        radius = np.maximum(1, size[visible].astype(np.int64))
+        alpha = np.clip((255 * (self.life[visible] / self.max_life[visible])).astype(np.int64), 0, 255)
+        color = self.color[visible].astype(np.int64)
+        color -= color % PARTICLE_COLOR_QUANTUM
+        alpha -= alpha % PARTICLE_ALPHA_QUANTUM
+        keys = (radius << 32) | (color[:, 0] << 24) | (color[:, 1] << 16) | (color[:, 2] << 8) | alpha
+        
+        get_stamp = particle_stamps.get
+        batch = [
+            (get_stamp(key), (x, y))
+            for key, x, y in zip(
+                keys.tolist(),
+                (screen_x[visible] - radius).tolist(),
+                (screen_y[visible] - radius).tolist()
+            )
+        ]
+        return surface.blits(batch)
+    
+    def _base_color(self, color, default):
+        if color is None:
+            return default
+        return tuple(max(0, min(255, int(c))) for c in color[:3])
+    
+    def add_explosion(self, x, y, color):
+        r, g, b = self._base_color(color, (220, 100, 100))
+        softened_color = np.array([min(255, int(r * 0.9)), min(255, int(g * 0.9)), min(255, int(b * 0.9))])
+        
+        amount = DEATH_EXPLOSION_SIZE
+        rng = self.rng
+        angle = rng.uniform(0, math.pi * 2, amount)
+        speed = rng.uniform(2, 7, amount)
+        colors = softened_color + rng.integers(-15, 16, (amount, 3))
+        
+        self.emit(
+            x, y,
+            np.cos(angle) * speed,
+            np.sin(angle) * speed,
+            rng.uniform(3, 10, amount),
+            colors,
+            rng.uniform(0.5, 1.3, amount),
+            gravity=0.1
+        )
+    
+    def add_food_sparkle(self, x, y, color):
+        r, g, b = self._base_color(color, (220, 220, 100))
+        bright_color = (min(255, r + 70), min(255, g + 70), min(255, b + 70))
+        
+        amount = 6
+        rng = self.rng
+        angle = rng.uniform(0, math.pi * 2, amount)
+        speed = rng.uniform(0.8, 2.5, amount)
+        
+        self.emit(
+            x, y,
+            np.cos(angle) * speed,
+            np.sin(angle) * speed,
+            rng.uniform(1.5, 4, amount),
+            bright_color,
+            rng.uniform(0.2, 0.6, amount)
+        )
+
+
+def create_particle_system(rng=random):
+    if np is not None:
+        return ArrayParticleSystem(rng=rng)
+    return ParticleSystem(rng)
+
 class TextEffect:
     def __init__(self, x, y, text, color, size=20, life=1.0, vel_y=-1.5):
         self.x = x
@@ -167,8 +356,7 @@ class TextEffect:
         self.max_life = life
         self.vel_y = vel_y
         
-        self.font = pygame.font.SysFont(UI_FONT, size)
-        self.text_surface = self.font.render(text, True, color)
+        self.text_surface = render_text(text, UI_FONT, size, color).copy()
         
     def update(self, dt):
         self.y += self.vel_y * dt * 60
@@ -181,12 +369,11 @@ class TextEffect:
         
         alpha = int(255 * (self.life / self.max_life))
         
-        alpha_surface = self.text_surface.copy()
-        alpha_surface.set_alpha(alpha)
+        self.text_surface.set_alpha(alpha)
         
-        text_rect = alpha_surface.get_rect(center=(screen_x, screen_y))
+        text_rect = self.text_surface.get_rect(center=(screen_x, screen_y))
         
-        surface.blit(alpha_surface, text_rect)
+        return surface.blit(self.text_surface, text_rect)
 
 class FloatingText:
     def __init__(self):
@@ -203,8 +390,7 @@ class FloatingText:
                 i += 1
     
     def draw(self, surface, camera_x, camera_y):
-        for text in self.texts:
-            text.draw(surface, camera_x, camera_y)
+        return [text.draw(surface, camera_x, camera_y) for text in self.texts]
     
     def add_text(self, x, y, text, color=WHITE, size=20):
         self.texts.append(TextEffect(x, y, text, color, size))
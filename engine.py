@@ -0,0 +1,304 @@
+import random
+import math
+import hashlib
+import time
+from config import *
+from snake import Snake
+from food import FoodManager
+from ai import AI
+from effects import create_particle_system
+from spatial import SpatialHash
+from collision import find_contacts, resolve_kills
+from world import SnakeArrays, ArraySnake, VECTORIZE_AVAILABLE
+
+PHASES = ("effects", "food", "ai", "move", "collisions", "spawn")
+
+def make_rng(seed, round_number, stream):
+    return random.Random(f"{seed}/{round_number}/{stream}")
+
+class Engine:
+    def __init__(self, vectorized=ENGINE_VECTORIZED, seed=SESSION_SEED):
+        self.vectorized = vectorized and VECTORIZE_AVAILABLE
+        self.world = None
+
+        if seed is None:
+            seed = random.SystemRandom().randrange(1 << 32)
+        self.seed = seed
+        self.round_number = 0
+        self.seed_streams()
+
+        self.tick = 0
+        self.time_played = 0
+        self.difficulty = 1.0
+
+        self.view_x = 0
+        self.view_y = 0
+
+        self.player = None
+        self.snakes = []
+        self.snake_pool = []
+        self.num_ai_snakes = NUM_AI_SNAKES
+        self.respawn_floor = NUM_AI_SNAKES // 2
+        self.segment_grid = SpatialHash(HEAD_RADIUS + SEGMENT_RADIUS)
+        self.food_manager = FoodManager(self.food_rng)
+        self.particle_system = create_particle_system(self.effects_rng)
+        self.ai = AI(self, self.ai_rng)
+
+        self.text_events = []
+        self.phase_times = None
+        self.tick_phases = None
+
+    def enable_profiling(self):
+        self.phase_times = {phase: [] for phase in PHASES}
+
+    def lap(self, phase, start):
+        now = time.perf_counter()
+        self.tick_phases[phase] += now - start
+        return now
+
+    def seed_streams(self):
+        self.spawn_rng = make_rng(self.seed, self.round_number, "spawn")
+        self.ai_rng = make_rng(self.seed, self.round_number, "ai")
+        self.food_rng = make_rng(self.seed, self.round_number, "food")
+        self.effects_rng = make_rng(self.seed, self.round_number, "effects")
+
+    def reset(self, player_skin=None, with_player=True, num_ai_snakes=NUM_AI_SNAKES, seed=None, respawn_floor=None):
+        self.tick = 0
+        self.time_played = 0
+        self.difficulty = 1.0
+        self.text_events = []
+        self.num_ai_snakes = num_ai_snakes
+        self.respawn_floor = num_ai_snakes // 2 if respawn_floor is None else respawn_floor
+        self.ai.discard_pending()
+
+        if seed is not None:
+            self.seed = seed
+            self.round_number = 0
+        self.round_number += 1
+        self.seed_streams()
+        self.ai.rng = self.ai_rng
+        self.ai.decision_slot = 0
+        self.particle_system = create_particle_system(self.effects_rng)
+
+        if self.vectorized:
+            self.snake_pool = []
+            self.world = SnakeArrays()
+        else:
+            self.snake_pool.extend(self.snakes)
+
+        self.player = None
+        self.snakes = []
+        self.segment_grid = SpatialHash(HEAD_RADIUS + SEGMENT_RADIUS)
+
+        if with_player:
+            player_x = WORLD_WIDTH // 2
+            player_y = WORLD_HEIGHT // 2
+            if player_skin is None:
+                self.player = self.create_snake(player_x, player_y, GREEN, is_player=True)
+            else:
+                self.player = self.create_snake(player_x, player_y, GREEN, is_player=True, skin_index=player_skin)
+                self.player.set_skin(player_skin)
+
+        self.spawn_ai_snakes(num_ai_snakes)
+
+        self.food_manager = FoodManager(self.food_rng)
+
+    def spawn_ai_snakes(self, count):
+        if self.player:
+            player_x, player_y = self.player.get_head_position()
+        else:
+            player_x, player_y = WORLD_WIDTH // 2, WORLD_HEIGHT // 2
+
+        rng = self.spawn_rng
+        for _ in range(count):
+            while True:
+                x = rng.randint(100, WORLD_WIDTH - 100)
+                y = rng.randint(100, WORLD_HEIGHT - 100)
+                dist = math.sqrt((x - player_x)**2 + (y - player_y)**2)
+                if dist > 300:
+                    break
+            self.create_snake(x, y)
+
+    def create_snake(self, x, y, color=None, is_player=False, skin_index=0):
+        if self.snake_pool:
+            snake = self.snake_pool.pop()
+            snake.reset(x, y, color, is_player, skin_index, self.spawn_rng)
+        elif self.world is not None:
+            snake = ArraySnake(self.world, x, y, color, is_player, skin_index, self.spawn_rng)
+        else:
+            snake = Snake(x, y, color, is_player, skin_index, self.spawn_rng)
+        if not is_player:
+            snake.decision_counter = self.ai.next_decision_offset()
+        return self.add_snake(snake)
+
+    def add_snake(self, snake):
+        snake.attach_grid(self.segment_grid)
+        self.snakes.append(snake)
+        return snake
+
+    def reclaim_dead_snakes(self):
+        live = []
+        for snake in self.snakes:
+            if snake.alive or snake is self.player:
+                live.append(snake)
+            else:
+                self.snake_pool.append(snake)
+        self.snakes = live
+
+    def close(self):
+        self.ai.close()
+
+    def state_digest(self):
+        digest = hashlib.sha256()
+        digest.update(repr((self.seed, self.round_number, self.tick)).encode())
+        for snake in self.snakes:
+            digest.update(repr((
+                snake.is_player, snake.alive, snake.score, snake.angle, snake.target_angle,
+                snake.boosting, list(snake.segments)
+            )).encode())
+        for food in self.food_manager.foods:
+            digest.update(repr((food.x, food.y, food.value)).encode())
+        return digest.hexdigest()
+
+    def population(self):
+        live = sum(1 for snake in self.snakes if snake.alive)
+        return live, len(self.snake_pool)
+
+    def set_view(self, x, y):
+        self.view_x = x
+        self.view_y = y
+
+    def drain_text_events(self):
+        events = self.text_events
+        self.text_events = []
+        return events
+
+    def step(self, n_ticks=1):
+        for _ in range(n_ticks):
+            self.update()
+
+    def update(self):
+        profiling = self.phase_times is not None
+        if profiling:
+            self.tick_phases = dict.fromkeys(PHASES, 0.0)
+            mark = time.perf_counter()
+
+        self.tick += 1
+
+        self.particle_system.update(1/FPS)
+        if profiling:
+            mark = self.lap("effects", mark)
+
+        self.time_played += 1 / FPS
+        self.difficulty = min(MAX_DIFFICULTY, 1.0 + self.time_played * DIFFICULTY_INCREASE_RATE)
+
+        self.food_manager.update(self.segment_grid)
+        if profiling:
+            mark = self.lap("food", mark)
+
+        self.ai.perceive(self.snakes, self.food_manager)
+        self.ai.update(self.snakes, self.player)
+        if profiling:
+            mark = self.lap("ai", mark)
+
+        if self.world is not None:
+            moves = self.world.step(self.snakes, self.segment_grid)
+        else:
+            moves = [(snake,) + snake.move() for snake in self.snakes if snake.alive]
+
+        all_dropped_segments = []
+
+        for snake, dropped_segments, score_reduced in moves:
+            if snake is self.player and score_reduced:
+                head_x, head_y = snake.get_head_position()
+                self.text_events.append((head_x, head_y - 30, "-1", (255, 100, 100), 16))
+
+            for segment in dropped_segments:
+                all_dropped_segments.append((segment, snake.color))
+
+        for segment, color in all_dropped_segments:
+            self.food_manager.add_food_at_position(segment[0], segment[1], BOOST_FOOD_SIZE, color)
+        if profiling:
+            mark = self.lap("move", mark)
+
+        self.check_collisions()
+        if profiling:
+            mark = self.lap("collisions", mark)
+
+        self.eat_food()
+        if profiling:
+            mark = self.lap("food", mark)
+
+        self.reclaim_dead_snakes()
+        self.respawn_ai_snakes()
+        if profiling:
+            self.lap("spawn", mark)
+            for phase, elapsed in self.tick_phases.items():
+                self.phase_times[phase].append(elapsed)
+
+    def respawn_ai_snakes(self):
+        alive_ai = sum(1 for snake in self.snakes if snake is not self.player and snake.alive)
+        if alive_ai < self.respawn_floor:
+            rng = self.spawn_rng
+            for _ in range(min(max(2, self.num_ai_snakes // 50), self.num_ai_snakes - alive_ai)):
+                while True:
+                    x = rng.randint(100, WORLD_WIDTH - 100)
+                    y = rng.randint(100, WORLD_HEIGHT - 100)
+                    if (x < self.view_x - 100 or x > self.view_x + WINDOW_WIDTH + 100 or
+                        y < self.view_y - 100 or y > self.view_y + WINDOW_HEIGHT + 100):
+                        break
+                self.create_snake(x, y)
+
+    def check_collisions(self):
+        all_dropped_food = []
+
+        for snake in self.snakes:
+            if snake.alive and snake.check_boundary_collision(WORLD_WIDTH, WORLD_HEIGHT):
+                head_x, head_y = snake.get_head_position()
+                self.particle_system.add_explosion(head_x, head_y, snake.color)
+
+                dropped_food = snake.die()
+                all_dropped_food.extend(dropped_food)
+
+                if snake is self.player:
+                    print("Player died: Hit the boundary")
+
+        contacts = find_contacts(self.snakes, self.segment_grid)
+
+        for victim, killer in resolve_kills(contacts):
+            snake1 = self.snakes[victim]
+
+            dropped_food = snake1.die()
+            all_dropped_food.extend(dropped_food)
+
+            if killer is None:
+                if snake1 is self.player:
+                    print("Player died: Self collision")
+                continue
+
+            bonus_points = len(snake1.segments) // 5
+            if bonus_points > 0:
+                self.snakes[killer].score += bonus_points
+
+            if snake1 is self.player:
+                print(f"Player died: Collision with snake {killer}")
+
+        for food_x, food_y, value in all_dropped_food:
+            self.food_manager.add_food_at_position(food_x, food_y, value)
+
+    def eat_food(self):
+        for snake in self.snakes:
+            if not snake.alive:
+                continue
+
+            head_x, head_y = snake.get_head_position()
+            value = self.food_manager.check_collision(head_x, head_y, snake.head_radius)
+
+            if value > 0:
+                self.particle_system.add_food_sparkle(head_x, head_y, snake.color)
+
+                if snake is self.player:
+                    points_text = f"+{value * GROWTH_PER_FOOD}"
+                    self.text_events.append((head_x, head_y - 20, points_text, snake.color, 18))
+
+                snake.grow(value * GROWTH_PER_FOOD)
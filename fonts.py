@@ -0,0 +1,36 @@
+import pygame
+from collections import OrderedDict
+from config import *
+
+_fonts = {}
+
+def get_font(face, size, bold=False):
+    key = (face, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(face, size, bold=bold)
+        _fonts[key] = font
+    return font
+
+class TextCache:
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+    
+    def render(self, text, font, color):
+        key = (text, font, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+text_cache = TextCache()
+
+def render_text(text, face, size, color, bold=False):
+    return text_cache.render(text, get_font(face, size, bold), color)
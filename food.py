@@ -1,22 +1,29 @@
 import random
 import pygame
 import math
+from collections import OrderedDict
 from config import *
+from spatial import SpatialHash
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 class Food:
-    def __init__(self, x, y, value=1, color=None):
+    def __init__(self, x, y, value=1, color=None, rng=random):
         self.x = x
         self.y = y
         self.value = value
         self.radius = 5 + value
-        self.color = color if color else self._get_random_color()
-        self.pulse_size = 0
-        self.pulse_dir = 0.1
-        self.pulse_speed = random.uniform(0.05, 0.15)
-        self.rotation = random.uniform(0, 360)
-        self.spin_speed = random.uniform(-3, 3)
+        self.color = color if color else self._get_random_color(rng)
+        self.pulse_speed = rng.uniform(0.05, 0.15)
+        self.rotation = rng.uniform(0, 360)
+        self.spin_speed = rng.uniform(-3, 3)
+        self.spawn_tick = 0
+        self.index = -1
         
-    def _get_random_color(self):
+    def _get_random_color(self, rng):
         base_colors = [
             (255, 100, 100),
             (100, 255, 100),
@@ -27,172 +34,248 @@ class Food:
             (100, 255, 255),
             (255, 100, 255),
         ]
-        return random.choice(base_colors)
-        
-    def update(self):
-        self.pulse_size += self.pulse_dir * self.pulse_speed
-        if self.pulse_size > 1.0:
-            self.pulse_size = 1.0
-            self.pulse_dir = -0.1
-        elif self.pulse_size < 0.0:
-            self.pulse_size = 0.0
-            self.pulse_dir = 0.1
-            
-        self.rotation += self.spin_speed
-        if self.rotation >= 360:
-            self.rotation -= 360
-        elif self.rotation < 0:
-            self.rotation += 360
-        
-    def draw(self, surface, camera_x, camera_y):
-        screen_x = int(self.x - camera_x)
-        screen_y = int(self.y - camera_y)
-        
-        if (screen_x + self.radius < 0 or screen_x - self.radius > WINDOW_WIDTH or
-            screen_y + self.radius < 0 or screen_y - self.radius > WINDOW_HEIGHT):
-            return
-        
-        if self.value <= 2:
-            self._draw_circle_food(surface, screen_x, screen_y)
-        else:
-            sides = min(8, self.value + 3)
-            self._draw_polygon_food(surface, screen_x, screen_y, sides)
+        return rng.choice(base_colors)
     
-    def _draw_circle_food(self, surface, x, y):
-        pulse_radius = self.radius + int(self.pulse_size * 3)
-        
-        food_surface = pygame.Surface((pulse_radius*2+2, pulse_radius*2+2), pygame.SRCALPHA)
-        
-        if self.pulse_size > 0:
-            for r in range(pulse_radius, self.radius, -1):
-                alpha = int(max(0, min(150, 180 * (1 - (r - self.radius) / (pulse_radius - self.radius + 0.1)) * self.pulse_size)))
-                pygame.draw.circle(
-                    food_surface,
-                    (*self.color, alpha),
-                    (pulse_radius+1, pulse_radius+1),
-                    r
-                )
-        
-        pygame.draw.circle(
-            food_surface,
-            self.color,
-            (pulse_radius+1, pulse_radius+1),
-            self.radius
+    def pulse_at(self, tick):
+        phase = ((tick - self.spawn_tick) * 0.1 * self.pulse_speed) % 2.0
+        return phase if phase <= 1.0 else 2.0 - phase
+    
+    def rotation_at(self, tick):
+        return (self.rotation + (tick - self.spawn_tick) * self.spin_speed) % 360
+
+
+def _render_circle_food(color, value, pulse_size):
+    radius = 5 + value
+    pulse_radius = radius + int(pulse_size * 3)
+    
+    food_surface = pygame.Surface((pulse_radius*2+2, pulse_radius*2+2), pygame.SRCALPHA)
+    
+    if pulse_size > 0:
+        for r in range(pulse_radius, radius, -1):
+            alpha = int(max(0, min(150, 180 * (1 - (r - radius) / (pulse_radius - radius + 0.1)) * pulse_size)))
+            pygame.draw.circle(
+                food_surface,
+                (*color, alpha),
+                (pulse_radius+1, pulse_radius+1),
+                r
+            )
+    
+    pygame.draw.circle(
+        food_surface,
+        color,
+        (pulse_radius+1, pulse_radius+1),
+        radius
+    )
+    
+    highlight_radius = max(2, int(radius * 0.6))
+    highlight_offset = int(radius * 0.2)
+    highlight_color = (255, 255, 255, 180)
+    
+    pygame.draw.ellipse(
+        food_surface,
+        highlight_color,
+        (
+            pulse_radius+1-highlight_radius//2-highlight_offset, 
+            pulse_radius+1-highlight_radius//2-highlight_offset,  
+            highlight_radius,
+            highlight_radius//1.3
         )
+    )
+    
+    if radius > 5:
+        reflection_radius = int(radius * 0.4)
+        reflection_offset = int(radius * 0.5)
         
-        highlight_radius = max(2, int(self.radius * 0.6))
-        highlight_offset = int(self.radius * 0.2)
-        highlight_color = (255, 255, 255, 180)
-        
-        pygame.draw.ellipse(
+        pygame.draw.circle(
             food_surface,
-            highlight_color,
-            (
-                pulse_radius+1-highlight_radius//2-highlight_offset, 
-                pulse_radius+1-highlight_radius//2-highlight_offset,  
-                highlight_radius,
-                highlight_radius//1.3
-            )
+            WHITE,
+            (pulse_radius+1, pulse_radius+1 + reflection_offset),
+            reflection_radius
         )
-        
-        surface.blit(food_surface, (x-pulse_radius-1, y-pulse_radius-1))
-        
-        if self.radius > 5:
-            reflection_radius = int(self.radius * 0.4)
-            reflection_offset = int(self.radius * 0.5)
-            reflection_color = (255, 255, 255, 70)
-            
-            pygame.draw.circle(
-                surface,
-                reflection_color,
-                (x, y + reflection_offset),
-                reflection_radius
-            )
     
-    def _draw_polygon_food(self, surface, x, y, sides):
-        points = []
-        radius = self.radius + int(self.pulse_size * 2)
-        for i in range(sides):
-            angle = math.radians(self.rotation + i * (360 / sides))
-            px = x + math.cos(angle) * radius
-            py = y + math.sin(angle) * radius
-            points.append((px, py))
-        
-        polygon_surface = pygame.Surface((radius*2+2, radius*2+2), pygame.SRCALPHA)
-        
-        offset_points = [(p[0]-x+radius+1, p[1]-y+radius+1) for p in points]
-        
-        glow_color = (*self.color, 100)
-        pygame.draw.polygon(polygon_surface, glow_color, offset_points)
-        
-        inner_points = []
-        inner_radius = radius * 0.8
-        for i in range(sides):
-            angle = math.radians(self.rotation + i * (360 / sides))
-            px = radius+1 + math.cos(angle) * inner_radius
-            py = radius+1 + math.sin(angle) * inner_radius
-            inner_points.append((px, py))
+    return food_surface, pulse_radius + 1
+
+
+def _render_polygon_food(color, value, pulse_size, rotation):
+    sides = min(8, value + 3)
+    radius = 5 + value + int(pulse_size * 2)
+    
+    polygon_surface = pygame.Surface((radius*2+2, radius*2+2), pygame.SRCALPHA)
+    
+    outer_points = []
+    inner_points = []
+    inner_radius = radius * 0.8
+    for i in range(sides):
+        angle = math.radians(rotation + i * (360 / sides))
+        outer_points.append((radius+1 + math.cos(angle) * radius, radius+1 + math.sin(angle) * radius))
+        inner_points.append((radius+1 + math.cos(angle) * inner_radius, radius+1 + math.sin(angle) * inner_radius))
+    
+    glow_color = (*color, 100)
+    pygame.draw.polygon(polygon_surface, glow_color, outer_points)
+    
+    inner_color = tuple(min(255, c + 50) for c in color)
+    pygame.draw.polygon(polygon_surface, inner_color, inner_points)
+    
+    highlight_radius = radius * 0.3
+    pygame.draw.circle(
+        polygon_surface,
+        (255, 255, 255, 200),
+        (radius+1, radius+1),
+        int(highlight_radius)
+    )
+    
+    return polygon_surface, radius + 1
+
+
+class FoodSpriteCache:
+    def __init__(self, max_size=FOOD_SPRITE_CACHE_SIZE):
+        self.max_size = max_size
+        self.sprites = OrderedDict()
+    
+    def get(self, food, tick):
+        pulse_step = int(food.pulse_at(tick) * FOOD_PULSE_STEPS + 0.5)
+        if food.value <= 2:
+            rotation_step = 0
+        else:
+            rotation_step = int(food.rotation_at(tick) * FOOD_ROTATION_STEPS / 360) % FOOD_ROTATION_STEPS
         
-        inner_color = tuple(min(255, c + 50) for c in self.color)
-        pygame.draw.polygon(polygon_surface, inner_color, inner_points)
+        key = (food.color, food.value, pulse_step, rotation_step)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            return sprite
         
-        highlight_radius = radius * 0.3
-        pygame.draw.circle(
-            polygon_surface,
-            (255, 255, 255, 200),
-            (radius+1, radius+1),
-            int(highlight_radius)
-        )
+        pulse_size = pulse_step / FOOD_PULSE_STEPS
+        if food.value <= 2:
+            sprite = _render_circle_food(food.color, food.value, pulse_size)
+        else:
+            rotation = rotation_step * 360 / FOOD_ROTATION_STEPS
+            sprite = _render_polygon_food(food.color, food.value, pulse_size, rotation)
         
-        surface.blit(polygon_surface, (x-radius-1, y-radius-1))
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_size:
+            self.sprites.popitem(last=False)
+        return sprite
+    
+    def clear(self):
+        self.sprites.clear()
+
+
+food_sprites = FoodSpriteCache()
 
 class FoodManager:
-    def __init__(self):
+    def __init__(self, rng=random, max_items=MAX_FOOD_ITEMS):
+        self.rng = rng
+        self.max_items = max_items
         self.foods = []
+        self.grid = SpatialHash(FOOD_GRID_CELL_SIZE)
+        self.max_radius = 0
+        self.tick = 0
+        
+        if np is not None:
+            self.positions = np.zeros((max_items, 2))
+            self.values = np.zeros(max_items)
+        
+    def _add_food(self, food):
+        food.spawn_tick = self.tick
+        food.index = len(self.foods)
+        self.foods.append(food)
+        self.grid.insert(food, None, food.x, food.y)
+        if np is not None:
+            if food.index == len(self.values):
+                self.positions = np.concatenate([self.positions, np.zeros_like(self.positions)])
+                self.values = np.concatenate([self.values, np.zeros_like(self.values)])
+            self.positions[food.index] = (food.x, food.y)
+            self.values[food.index] = food.value
+        if food.radius > self.max_radius:
+            self.max_radius = food.radius
+    
+    def remove_food(self, food):
+        last = self.foods.pop()
+        if last is not food:
+            self.foods[food.index] = last
+            last.index = food.index
+            if np is not None:
+                self.positions[food.index] = self.positions[len(self.foods)]
+                self.values[food.index] = self.values[len(self.foods)]
+        food.index = -1
+        self.grid.remove(food, None, food.x, food.y)
+    
+    def query_radius(self, x, y, radius):
+        radius_sq = radius * radius
+        found = []
+        for food, _, food_x, food_y in self.grid.query(x, y, radius):
+            if (food_x - x) ** 2 + (food_y - y) ** 2 < radius_sq:
+                found.append(food)
+        return found
         
-    def spawn_food(self, snake_positions):
-        if len(self.foods) < MAX_FOOD_ITEMS and random.random() < FOOD_SPAWN_RATE:
+    def spawn_food(self, segment_grid):
+        rng = self.rng
+        if len(self.foods) < self.max_items and rng.random() < FOOD_SPAWN_RATE:
             margin = 100
-            x = random.randint(margin, WORLD_WIDTH - margin)
-            y = random.randint(margin, WORLD_HEIGHT - margin)
+            x = rng.randint(margin, WORLD_WIDTH - margin)
+            y = rng.randint(margin, WORLD_HEIGHT - margin)
             
             too_close = False
-            for snake_pos in snake_positions:
-                for pos in snake_pos:
-                    if ((pos[0] - x) ** 2 + (pos[1] - y) ** 2) < 400:
-                        too_close = True
-                        break
-                if too_close:
+            for _, _, seg_x, seg_y in segment_grid.query(x, y, 20):
+                if ((seg_x - x) ** 2 + (seg_y - y) ** 2) < 400:
+                    too_close = True
                     break
             
             if not too_close:
-                if random.random() < 0.1:
-                    value = random.randint(2, 5)
-                    self.foods.append(Food(x, y, value, YELLOW))
+                if rng.random() < 0.1:
+                    value = rng.randint(2, 5)
+                    self._add_food(Food(x, y, value, YELLOW, rng))
                 else:
-                    self.foods.append(Food(x, y))
+                    self._add_food(Food(x, y, rng=rng))
                     
-    def update(self, snake_positions):
-        self.spawn_food(snake_positions)
-        
-        for food in self.foods:
-            food.update()
+    def populate(self, count):
+        rng = self.rng
+        margin = 100
+        for _ in range(count):
+            if len(self.foods) >= self.max_items:
+                break
+            x = rng.randint(margin, WORLD_WIDTH - margin)
+            y = rng.randint(margin, WORLD_HEIGHT - margin)
+            self._add_food(Food(x, y, rng.randint(1, 5), rng=rng))
+    
+    def update(self, segment_grid):
+        self.tick += 1
+        self.spawn_food(segment_grid)
         
     def draw(self, surface, camera_x, camera_y, view_width, view_height):
-        for food in self.foods:
-            food.draw(surface, camera_x, camera_y)
+        center_x = camera_x + view_width / 2
+        center_y = camera_y + view_height / 2
+        reach = max(view_width, view_height) / 2 + self.max_radius + 4
+        
+        batch = []
+        for food, _, food_x, food_y in self.grid.query(center_x, center_y, reach):
+            screen_x = int(food_x - camera_x)
+            screen_y = int(food_y - camera_y)
+            
+            if (screen_x + food.radius < 0 or screen_x - food.radius > view_width or
+                screen_y + food.radius < 0 or screen_y - food.radius > view_height):
+                continue
+            
+            sprite, half_size = food_sprites.get(food, self.tick)
+            batch.append((sprite, (screen_x - half_size, screen_y - half_size)))
+        
+        return surface.blits(batch)
             
     def check_collision(self, x, y, radius):
-        for i, food in enumerate(self.foods):
-            distance = ((food.x - x) ** 2 + (food.y - y) ** 2) ** 0.5
+        reach = radius + self.max_radius - COLLISION_BUFFER
+        if reach <= 0:
+            return 0
+        for food, _, food_x, food_y in self.grid.query(x, y, reach):
+            distance = ((food_x - x) ** 2 + (food_y - y) ** 2) ** 0.5
             if distance < (radius + food.radius - COLLISION_BUFFER):
                 value = food.value
-                self.foods.pop(i)
+                self.remove_food(food)
                 return value
         return 0
     
     def add_food_at_position(self, x, y, value=1, color=None):
-        if len(self.foods) < MAX_FOOD_ITEMS:
+        if len(self.foods) < self.max_items:
             if color is None:
                 boost_food_color = (100, 200, 255)
             else:
@@ -203,4 +286,4 @@ class FoodManager:
                     min(255, b + 50)
                 )
                 
-            self.foods.append(Food(x, y, value, boost_food_color))
+            self._add_food(Food(x, y, value, boost_food_color, self.rng))
@@ -4,10 +4,11 @@ import math
 import os
 import json
 from config import *
-from snake import Snake
-from food import FoodManager
-from ai import AI
-from effects import ParticleSystem, FloatingText
+from snake import get_skin_palette
+from engine import Engine
+from effects import FloatingText
+from fonts import render_text
+from minimap import Minimap
 
 class Game:
     def __init__(self):
@@ -15,7 +16,6 @@ class Game:
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption(TITLE)
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont(UI_FONT, SCORE_FONT_SIZE)
         
         if ENABLE_LOADING_SCREEN:
             self.show_loading_screen()
@@ -28,43 +28,63 @@ class Game:
         self.running = True
         self.game_over = False
         self.restart_timer = 0
-        self.difficulty = 1.0
-        self.time_played = 0
         self.in_menu = True
         self.selected_skin = 0
         self.menu_state = "main"
         
         
         
-        self.particle_system = ParticleSystem()
+        self.engine = Engine()
         self.floating_text = FloatingText()
         
-        self.player = None
-        self.snakes = []
-        self.food_manager = FoodManager()
-        self.ai = AI(self)
-        
         self.skins = SKINS
         
       
         
         self.scoreboard = self.load_scoreboard()
         
-        self.minimap_surface = pygame.Surface((MINIMAP_SIZE, MINIMAP_SIZE))
+        self.minimap = Minimap()
+        
+        self.dirty_rects = []
+        self.previous_dirty_rects = []
+        self.hud_signatures = {}
+        self.last_view = None
+        self.background_tile = self.create_background_tile()
         
         self.setup_new_game()
 
+    @property
+    def player(self):
+        return self.engine.player
+
+    @property
+    def snakes(self):
+        return self.engine.snakes
+
+    @property
+    def food_manager(self):
+        return self.engine.food_manager
+
+    @property
+    def particle_system(self):
+        return self.engine.particle_system
+
+    @property
+    def time_played(self):
+        return self.engine.time_played
+
+    @property
+    def difficulty(self):
+        return self.engine.difficulty
+
     def show_loading_screen(self):
         self.screen.fill(LOADING_SCREEN_BG_COLOR)
         
-        loading_font = pygame.font.SysFont('Arial', 36)
-        title_font = pygame.font.SysFont('Arial', 48, bold=True)
-        
-        title_text = title_font.render("Snake IO", True, (255, 255, 255))
+        title_text = render_text("Snake IO", 'Arial', 48, (255, 255, 255), bold=True)
         title_rect = title_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 - 50))
         self.screen.blit(title_text, title_rect)
         
-        loading_text = loading_font.render("Loading...", True, LOADING_SCREEN_TEXT_COLOR)
+        loading_text = render_text("Loading...", 'Arial', 36, LOADING_SCREEN_TEXT_COLOR)
         loading_rect = loading_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 + 20))
         self.screen.blit(loading_text, loading_rect)
         
@@ -88,8 +108,7 @@ class Game:
             
             pygame.time.delay(100)
     
-    def create_grid_texture(self):
-        texture_size = 200
+    def create_grid_texture(self, texture_size=200):
         texture = pygame.Surface((texture_size, texture_size), pygame.SRCALPHA)
         texture.fill((0, 0, 0, 0))
         
@@ -102,12 +121,16 @@ class Game:
                 
             for x in range(0, texture_size, GRID_SIZE):
                 for y in range(0, texture_size, GRID_SIZE):
-                    pygame.draw.circle(texture, PATTERN_COLOR, (x, y), 2)
+                    for wrap_x in (0, texture_size):
+                        for wrap_y in (0, texture_size):
+                            pygame.draw.circle(texture, PATTERN_COLOR, (x + wrap_x, y + wrap_y), 2)
                     
         elif MAP_DESIGN_STYLE == "minimal":
             for x in range(0, texture_size, GRID_SIZE):
                 for y in range(0, texture_size, GRID_SIZE):
-                    pygame.draw.circle(texture, (PATTERN_COLOR[0], PATTERN_COLOR[1], PATTERN_COLOR[2], 120), (x, y), 1)
+                    for wrap_x in (0, texture_size):
+                        for wrap_y in (0, texture_size):
+                            pygame.draw.circle(texture, (PATTERN_COLOR[0], PATTERN_COLOR[1], PATTERN_COLOR[2], 120), (x + wrap_x, y + wrap_y), 1)
                     
         else:
             for i in range(0, texture_size, GRID_SIZE):
@@ -116,6 +139,45 @@ class Game:
         
         return texture
     
+    def create_pattern_texture(self, texture_size):
+        texture = pygame.Surface((texture_size, texture_size), pygame.SRCALPHA)
+        texture.fill((0, 0, 0, 0))
+        
+        rng = random.Random(BACKGROUND_PATTERN_SEED)
+        density = MAP_DECORATION_DENSITY * texture_size * texture_size / (WINDOW_WIDTH * WINDOW_HEIGHT)
+        
+        for _ in range(max(1, int(density))):
+            pattern_x = rng.randint(0, texture_size - 1)
+            pattern_y = rng.randint(0, texture_size - 1)
+            
+            if BACKGROUND_PATTERN_STYLE == "dots":
+                size = rng.randint(1, 2)
+                alpha = rng.randint(20, 40)
+                color = (*PATTERN_COLOR, alpha)
+                for wrap_x in (-texture_size, 0, texture_size):
+                    for wrap_y in (-texture_size, 0, texture_size):
+                        pygame.draw.circle(texture, color, (pattern_x + wrap_x, pattern_y + wrap_y), size)
+        
+        return texture
+    
+    def create_background_tile(self):
+        tile_size = max(GRID_SIZE, BACKGROUND_TILE_SIZE // GRID_SIZE * GRID_SIZE)
+        tile = pygame.Surface((tile_size, tile_size)).convert()
+        tile.fill(BACKGROUND_COLOR)
+        
+        grid_surface = pygame.Surface((tile_size, tile_size), pygame.SRCALPHA)
+        for i in range(0, tile_size, GRID_SIZE):
+            pygame.draw.line(grid_surface, (*GRID_COLOR, 180), (i, 0), (i, tile_size), 1)
+            pygame.draw.line(grid_surface, (*GRID_COLOR, 180), (0, i), (tile_size, i), 1)
+        tile.blit(grid_surface, (0, 0))
+        
+        tile.blit(self.create_grid_texture(tile_size), (0, 0))
+        
+        if BACKGROUND_PATTERN:
+            tile.blit(self.create_pattern_texture(tile_size), (0, 0))
+        
+        return tile
+    
     def load_scoreboard(self):
         scoreboard_path = os.path.join(os.path.dirname(__file__), "scoreboard.json")
         try:
@@ -151,36 +213,18 @@ class Game:
     
     def setup_new_game(self):
         self.game_over = False
-        self.time_played = 0
-        self.difficulty = 1.0
-        
-        player_x = WORLD_WIDTH // 2
-        player_y = WORLD_HEIGHT // 2
-        self.player = Snake(player_x, player_y, GREEN, is_player=True, skin_index=self.selected_skin)
         
-        self.player.set_skin(self.selected_skin)
+        self.engine.reset(player_skin=self.selected_skin)
+        self.reset_camera()
+    
+    def reset_camera(self):
+        player_x, player_y = self.player.get_head_position()
         
         self.target_camera_x = player_x - WINDOW_WIDTH // 2
         self.target_camera_y = player_y - WINDOW_HEIGHT // 2
         self.camera_x = self.target_camera_x
         self.camera_y = self.target_camera_y
-        
-        self.snakes = [self.player]
-        self.spawn_ai_snakes(NUM_AI_SNAKES)
-        
-        self.food_manager = FoodManager()
-    
-    def spawn_ai_snakes(self, count):
-        player_x, player_y = self.player.get_head_position()
-        
-        for _ in range(count):
-            while True:
-                x = random.randint(100, WORLD_WIDTH - 100)
-                y = random.randint(100, WORLD_HEIGHT - 100)
-                dist = math.sqrt((x - player_x)**2 + (y - player_y)**2)
-                if dist > 300:
-                    break
-            self.snakes.append(Snake(x, y))
+        self.last_view = None
     
 
     
@@ -235,9 +279,8 @@ class Game:
     def draw_menu(self):
         self.screen.fill(MENU_BACKGROUND_COLOR)
         
-        title_font = pygame.font.SysFont(UI_FONT, 72, bold=True)
-        title_text = title_font.render("Snake IO", True, WHITE)
-        shadow_text = title_font.render("Snake IO", True, MENU_ACCENT_COLOR)
+        title_text = render_text("Snake IO", UI_FONT, 72, WHITE, bold=True)
+        shadow_text = render_text("Snake IO", UI_FONT, 72, MENU_ACCENT_COLOR, bold=True)
         title_rect = title_text.get_rect(center=(WINDOW_WIDTH//2, 100))
         self.screen.blit(shadow_text, (title_rect.x + 3, title_rect.y + 3))
         self.screen.blit(title_text, title_rect)
@@ -250,14 +293,12 @@ class Game:
         pygame.display.flip()
     
     def _draw_main_menu(self):
-        button_font = pygame.font.SysFont(UI_FONT, 32)
-        info_font = pygame.font.SysFont(UI_FONT, 16)
         
         play_button = pygame.Rect(WINDOW_WIDTH//2 - 100, WINDOW_HEIGHT//2 - 50, 200, 50)
         pygame.draw.rect(self.screen, BUTTON_COLOR, play_button, border_radius=10)
         pygame.draw.rect(self.screen, MENU_ACCENT_COLOR, play_button, 2, border_radius=10)
         
-        play_text = button_font.render("PLAY", True, BUTTON_TEXT_COLOR)
+        play_text = render_text("PLAY", UI_FONT, 32, BUTTON_TEXT_COLOR)
         play_rect = play_text.get_rect(center=play_button.center)
         self.screen.blit(play_text, play_rect)
         
@@ -265,11 +306,11 @@ class Game:
         pygame.draw.rect(self.screen, BUTTON_COLOR, skin_button, border_radius=10)
         pygame.draw.rect(self.screen, MENU_ACCENT_COLOR, skin_button, 2, border_radius=10)
         
-        skin_text = button_font.render("SKINS", True, BUTTON_TEXT_COLOR)
+        skin_text = render_text("SKINS", UI_FONT, 32, BUTTON_TEXT_COLOR)
         skin_rect = skin_text.get_rect(center=skin_button.center)
         self.screen.blit(skin_text, skin_rect)
         
-        instruction_text = info_font.render("WASD or Arrows to move | Space to boost | Esc to exit", True, (200, 200, 200))
+        instruction_text = render_text("WASD or Arrows to move | Space to boost | Esc to exit", UI_FONT, 16, (200, 200, 200))
         instruction_rect = instruction_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT - 40))
         self.screen.blit(instruction_text, instruction_rect)
         
@@ -279,11 +320,9 @@ class Game:
             self._draw_snake_preview(preview_x, preview_y, self.selected_skin)
     
     def _draw_skins_menu(self):
-        title_font = pygame.font.SysFont(UI_FONT, 36, bold=True)
-        button_font = pygame.font.SysFont(UI_FONT, 24)
         
-        title_shadow = title_font.render("Choose Snake Skin", True, (40, 60, 100))
-        title_text = title_font.render("Choose Snake Skin", True, WHITE)
+        title_shadow = render_text("Choose Snake Skin", UI_FONT, 36, (40, 60, 100), bold=True)
+        title_text = render_text("Choose Snake Skin", UI_FONT, 36, WHITE, bold=True)
         title_rect = title_text.get_rect(center=(WINDOW_WIDTH//2, 80))
         self.screen.blit(title_shadow, (title_rect.x + 2, title_rect.y + 2))
         self.screen.blit(title_text, title_rect)
@@ -298,7 +337,7 @@ class Game:
         pygame.draw.rect(self.screen, back_color, back_button, border_radius=8)
         pygame.draw.rect(self.screen, MENU_ACCENT_COLOR, back_button, 2, border_radius=8)
         
-        back_text = button_font.render("BACK", True, BUTTON_TEXT_COLOR)
+        back_text = render_text("BACK", UI_FONT, 24, BUTTON_TEXT_COLOR)
         back_rect = back_text.get_rect(center=back_button.center)
         self.screen.blit(back_text, back_rect)
         
@@ -329,13 +368,12 @@ class Game:
             border_width = 3 if i == self.selected_skin else 1
             pygame.draw.rect(self.screen, border_color, skin_rect, border_width, border_radius=10)
             
-            name_shadow = button_font.render(skin["name"], True, (20, 20, 30))
-            name_text = button_font.render(skin["name"], True, WHITE)
+            name_shadow = render_text(skin["name"], UI_FONT, 24, (20, 20, 30))
+            name_text = render_text(skin["name"], UI_FONT, 24, WHITE)
             name_rect = name_text.get_rect(centerx=x + skin_width//2, y=y + skin_height - 22)
             
             if i == self.selected_skin:
-                selected_font = pygame.font.SysFont(UI_FONT, 14)
-                selected_text = selected_font.render("SELECTED", True, (80, 200, 120))
+                selected_text = render_text("SELECTED", UI_FONT, 14, (80, 200, 120))
                 selected_rect = selected_text.get_rect(centerx=x + skin_width//2, y=y + skin_height - 40)
                 self.screen.blit(selected_text, selected_rect)
             
@@ -345,14 +383,8 @@ class Game:
             self._draw_snake_preview(x + skin_width//2, y + skin_height//2 - 15, i)
     
     def _draw_snake_preview(self, x, y, skin_index):
-        preview_snake = Snake(0, 0, skin_index=skin_index)
-        
-        preview_snake.color_cycle_timer = 0
-        
-        preview_snake.set_skin(skin_index)
-        
-        for i in range(preview_snake.MAX_SEGMENTS):
-            preview_snake.segment_colors[i] = preview_snake._compute_static_color(i)
+        skin = SKINS[skin_index]
+        palette = get_skin_palette(skin_index)
         
         segments = []
         segment_radius = 8
@@ -367,17 +399,15 @@ class Game:
                 offset_y = math.sin((i-6) * 0.5) * segment_radius * 2.2 + segment_radius * 4.5
             segments.append([x + offset_x - segment_radius * 4, y + offset_y])
         
-        preview_snake.segments = segments
-        
         for i in range(len(segments) - 1, -1, -1):
             segment = segments[i]
-            segment_color = preview_snake.segment_colors[i]
+            segment_color = palette[i]
             
             radius = head_radius if i == 0 else segment_radius
             
             pygame.draw.circle(self.screen, segment_color, (int(segment[0]), int(segment[1])), radius)
             
-            if i > 0 and preview_snake.skin["pattern"] != "solid" and i % 3 == 0:
+            if i > 0 and skin["pattern"] != "solid" and i % 3 == 0:
                 pattern_radius = int(radius * 0.7)
                 darker_color = tuple(max(0, c - 50) for c in segment_color)
                 pygame.draw.circle(self.screen, darker_color, (int(segment[0]), int(segment[1])), pattern_radius)
@@ -393,29 +423,9 @@ class Game:
     
     def restart_game(self):
         self.game_over = False
-        self.time_played = 0
-        self.difficulty = 1.0
-        
-        player_x = WORLD_WIDTH // 2
-        player_y = WORLD_HEIGHT // 2
-        self.player = Snake(player_x, player_y, GREEN, is_player=True)
-        
-        self.target_camera_x = player_x - WINDOW_WIDTH // 2
-        self.target_camera_y = player_y - WINDOW_HEIGHT // 2
-        self.camera_x = self.target_camera_x
-        self.camera_y = self.target_camera_y
         
-        self.snakes = [self.player]
-        for _ in range(NUM_AI_SNAKES):
-            while True:
-                x = random.randint(100, WORLD_WIDTH - 100)
-                y = random.randint(100, WORLD_HEIGHT - 100)
-                dist = math.sqrt((x - player_x)**2 + (y - player_y)**2)
-                if dist > 300:
-                    break
-            self.snakes.append(Snake(x, y))
-        
-        self.food_manager = FoodManager()
+        self.engine.reset()
+        self.reset_camera()
     
     def handle_game_events(self):
         for event in pygame.event.get():
@@ -463,16 +473,8 @@ class Game:
                 self.restart_game()
             return
         
-        self.particle_system.update(1/FPS)
         self.floating_text.update(1/FPS)
         
-        self.time_played += 1 / FPS
-        self.difficulty = min(MAX_DIFFICULTY, 1.0 + self.time_played * DIFFICULTY_INCREASE_RATE)
-        
-        snake_positions = [snake.segments for snake in self.snakes if snake.alive]
-        
-        self.food_manager.update(snake_positions)
-        
         if self.player.alive:
             head_x, head_y = self.player.get_head_position()
             mouse_x, mouse_y = pygame.mouse.get_pos()
@@ -488,31 +490,11 @@ class Game:
             self.camera_x = max(0, min(self.camera_x, WORLD_WIDTH - WINDOW_WIDTH))
             self.camera_y = max(0, min(self.camera_y, WORLD_HEIGHT - WINDOW_HEIGHT))
         
-        for snake in self.snakes:
-            if snake != self.player and snake.alive:
-                self.ai.update_snake(snake, self.snakes, self.food_manager.foods)
-        
-        all_dropped_segments = []
-        
-        for snake in self.snakes:
-            if snake.alive:
-                dropped_segments, score_reduced = snake.move()
-                
-                if snake == self.player and score_reduced:
-                    head_x, head_y = snake.get_head_position()
-                    self.floating_text.add_text(head_x, head_y - 30, "-1", color=(255, 100, 100), size=16)
-                
-                if dropped_segments and len(dropped_segments) > 0:
-                    for segment in dropped_segments:
-                        all_dropped_segments.append((segment, snake.color))
-        
-        for segment_data in all_dropped_segments:
-            segment, color = segment_data
-            self.food_manager.add_food_at_position(segment[0], segment[1], BOOST_FOOD_SIZE, color)
-        
-        self.check_collisions()
+        self.engine.set_view(self.camera_x, self.camera_y)
+        self.engine.step()
         
-        self.respawn_ai_snakes()
+        for x, y, text, color, size in self.engine.drain_text_events():
+            self.floating_text.add_text(x, y, text, color=color, size=size)
         
         if not self.player.alive and not self.game_over:
             head_x, head_y = self.player.get_head_position()
@@ -525,76 +507,6 @@ class Game:
             self.game_over = True
             self.restart_timer = 0
     
-    def respawn_ai_snakes(self):
-        alive_ai = sum(1 for snake in self.snakes if snake != self.player and snake.alive)
-        if alive_ai < NUM_AI_SNAKES // 2:
-            for _ in range(min(2, NUM_AI_SNAKES - alive_ai)):
-                while True:
-                    x = random.randint(100, WORLD_WIDTH - 100)
-                    y = random.randint(100, WORLD_HEIGHT - 100)
-                    if (x < self.camera_x - 100 or x > self.camera_x + WINDOW_WIDTH + 100 or
-                        y < self.camera_y - 100 or y > self.camera_y + WINDOW_HEIGHT + 100):
-                        break
-                self.snakes.append(Snake(x, y))
-    
-    def check_collisions(self):
-        all_dropped_food = []
-        
-        for snake in self.snakes:
-            if snake.alive and snake.check_boundary_collision(WORLD_WIDTH, WORLD_HEIGHT):
-                head_x, head_y = snake.get_head_position()
-                self.particle_system.add_explosion(head_x, head_y, snake.color)
-                
-                dropped_food = snake.die()
-                all_dropped_food.extend(dropped_food)
-                
-                if snake == self.player:
-                    print("Player died: Hit the boundary")
-        
-        for i, snake1 in enumerate(self.snakes):
-            if not snake1.alive:
-                continue
-            
-            if snake1.check_self_collision():
-                dropped_food = snake1.die()
-                all_dropped_food.extend(dropped_food)
-                if snake1 == self.player:
-                    print("Player died: Self collision")
-                continue
-            
-            for j, snake2 in enumerate(self.snakes):
-                if i != j and snake2.alive:
-                    if snake1.check_snake_collision(snake2):
-                        dropped_food = snake1.die()
-                        all_dropped_food.extend(dropped_food)
-                        
-                        bonus_points = len(snake1.segments) // 5
-                        if bonus_points > 0:
-                            snake2.score += bonus_points
-                        
-                        if snake1 == self.player:
-                            print(f"Player died: Collision with snake {j}")
-                        break
-        
-        for food_x, food_y, value in all_dropped_food:
-            self.food_manager.add_food_at_position(food_x, food_y, value)
-        
-        for snake in self.snakes:
-            if not snake.alive:
-                continue
-                
-            head_x, head_y = snake.get_head_position()
-            value = self.food_manager.check_collision(head_x, head_y, snake.head_radius)
-            
-            if value > 0:
-                self.particle_system.add_food_sparkle(head_x, head_y, snake.color)
-                
-                if snake == self.player:
-                    points_text = f"+{value * GROWTH_PER_FOOD}"
-                    self.floating_text.add_text(head_x, head_y - 20, points_text, color=snake.color, size=18)
-                
-                snake.grow(value * GROWTH_PER_FOOD)
-    
     def world_to_screen(self, x, y):
         return x - self.camera_x, y - self.camera_y
     
@@ -608,43 +520,17 @@ class Game:
             pygame.draw.line(self.screen, GRID_COLOR, (0, y), (WINDOW_WIDTH, y), 1)
     
     def draw_background(self):
-        self.screen.fill(BACKGROUND_COLOR)
-        
-        offset_x = int(-(self.camera_x % GRID_SIZE))
-        offset_y = int(-(self.camera_y % GRID_SIZE))
+        tile = self.background_tile
+        tile_size = tile.get_width()
         
-        grid_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
+        offset_x = -(int(self.camera_x) % tile_size)
+        offset_y = -(int(self.camera_y) % tile_size)
         
-        for x in range(offset_x, WINDOW_WIDTH + GRID_SIZE, GRID_SIZE):
-            pygame.draw.line(grid_surface, (*GRID_COLOR, 180), (x, 0), (x, WINDOW_HEIGHT), 1)
-        for y in range(offset_y, WINDOW_HEIGHT + GRID_SIZE, GRID_SIZE):
-            pygame.draw.line(grid_surface, (*GRID_COLOR, 180), (0, y), (WINDOW_WIDTH, y), 1)
-        
-        self.screen.blit(grid_surface, (0, 0))
-        
-        if BACKGROUND_PATTERN:
-            seed = int(self.camera_x + self.camera_y) // 100
-            random.seed(seed)
-            pattern_style = BACKGROUND_PATTERN_STYLE
-            
-            pattern_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
-            
-            for _ in range(MAP_DECORATION_DENSITY):
-                try:
-                    pattern_x = random.randint(0, WINDOW_WIDTH)
-                    pattern_y = random.randint(0, WINDOW_HEIGHT)
-                    
-                    if pattern_style == "dots":
-                        size = random.randint(1, 2)
-                        alpha = random.randint(20, 40)
-                        color = (*PATTERN_COLOR, alpha)
-                        pygame.draw.circle(pattern_surface, color, (pattern_x, pattern_y), size)
-                except Exception:
-                    pass
-            
-            self.screen.blit(pattern_surface, (0, 0))
-            
-            random.seed()
+        self.screen.blits([
+            (tile, (x, y))
+            for x in range(offset_x, WINDOW_WIDTH, tile_size)
+            for y in range(offset_y, WINDOW_HEIGHT, tile_size)
+        ], doreturn=False)
     
     def draw_boundary(self):
         x1, y1 = self.world_to_screen(0, 0)
@@ -714,96 +600,23 @@ class Game:
                     pygame.draw.circle(self.screen, MAP_BORDER_COLOR, (x, y2), BOUNDARY_WIDTH)
     
     def draw_minimap(self):
-        self.minimap_surface.fill((0, 0, 0, 0))
-        
-        minimap_rect = pygame.Rect(0, 0, MINIMAP_SIZE, MINIMAP_SIZE)
-        minimap_bg = pygame.Surface((MINIMAP_SIZE, MINIMAP_SIZE), pygame.SRCALPHA)
-        minimap_bg.fill((0, 0, 0, MINIMAP_OPACITY))
-        self.minimap_surface.blit(minimap_bg, (0, 0))
-        
-        scale_x = MINIMAP_SIZE / WORLD_WIDTH
-        scale_y = MINIMAP_SIZE / WORLD_HEIGHT
-        
-        grid_spacing = 40 * scale_x
-        for x in range(0, MINIMAP_SIZE, int(grid_spacing)):
-            pygame.draw.line(self.minimap_surface, (50, 50, 60, 100), (x, 0), (x, MINIMAP_SIZE), 1)
-        for y in range(0, MINIMAP_SIZE, int(grid_spacing)):
-            pygame.draw.line(self.minimap_surface, (50, 50, 60, 100), (0, y), (MINIMAP_SIZE, y), 1)
-        
-        pygame.draw.rect(self.minimap_surface, MAP_BORDER_COLOR, (0, 0, MINIMAP_SIZE, MINIMAP_SIZE), 2)
-        
-        view_x = int(self.camera_x * scale_x)
-        view_y = int(self.camera_y * scale_y)
-        view_width = int(WINDOW_WIDTH * scale_x)
-        view_height = int(WINDOW_HEIGHT * scale_y)
-        pygame.draw.rect(self.minimap_surface, WHITE, (view_x, view_y, view_width, view_height), 1)
-        
-        for snake in self.snakes:
-            if not snake.alive:
-                continue
-            positions = snake.segments
-            
-            if len(positions) > 1:
-                for i in range(1, min(len(positions), 15)):
-                    pos = positions[i]
-                    map_x = int(pos[0] * scale_x)
-                    map_y = int(pos[1] * scale_y)
-                    size = max(1, 3 - i // 5)
-                    alpha = max(50, 200 - i * 10)
-                    if 0 <= map_x <= MINIMAP_SIZE and 0 <= map_y <= MINIMAP_SIZE:
-                        if snake == self.player:
-                            color = (255, 255, 255, alpha)
-                        else:
-                            r, g, b = snake.color
-                            color = (r, g, b, alpha)
-                        
-                        dot_surface = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-                        pygame.draw.circle(dot_surface, color, (size, size), size)
-                        self.minimap_surface.blit(dot_surface, (map_x-size, map_y-size))
-            
-            head_x, head_y = snake.get_head_position()
-            map_x = int(head_x * scale_x)
-            map_y = int(head_y * scale_y)
-            
-            color = snake.color
-            if snake == self.player:
-                color = WHITE
-                size = 4
-            else:
-                size = 3
-                
-            pygame.draw.circle(self.minimap_surface, color, (map_x, map_y), size)
-        
-        for food in self.food_manager.foods:
-            map_x = int(food.x * scale_x)
-            map_y = int(food.y * scale_y)
-            if 0 <= map_x <= MINIMAP_SIZE and 0 <= map_y <= MINIMAP_SIZE:
-                size = 1 if food.value == 1 else 2
-                pygame.draw.circle(self.minimap_surface, food.color, (map_x, map_y), size)
-        
-        border_width = 2
-        border_rect = pygame.Rect(
-            MINIMAP_POSITION[0] - border_width,
-            MINIMAP_POSITION[1] - border_width,
-            MINIMAP_SIZE + border_width * 2,
-            MINIMAP_SIZE + border_width * 2
-        )
-        pygame.draw.rect(self.screen, (60, 60, 70), border_rect, border_width, border_radius=5)
-        self.screen.blit(self.minimap_surface, MINIMAP_POSITION)
+        self.mark_dirty(self.minimap.draw(self.screen, self.engine, self.camera_x, self.camera_y))
     
     def draw_game(self):
         self.draw_background()
         self.draw_boundary()
-        self.food_manager.draw(self.screen, self.camera_x, self.camera_y, WINDOW_WIDTH, WINDOW_HEIGHT)
-        self.particle_system.draw(self.screen, self.camera_x, self.camera_y)
+        self.mark_dirty(self.food_manager.draw(self.screen, self.camera_x, self.camera_y, WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.mark_dirty(self.particle_system.draw(self.screen, self.camera_x, self.camera_y))
         
         if self.player.alive:
             self.draw_danger_indicators()
         for snake in sorted(self.snakes, key=lambda s: 1 if s == self.player else 0):
             if snake.alive:
                 snake.draw(self.screen, self.camera_x, self.camera_y)
+                if RENDER_MODE == "dirty":
+                    self.mark_dirty([snake.screen_rect(self.camera_x, self.camera_y)])
         
-        self.floating_text.draw(self.screen, self.camera_x, self.camera_y)
+        self.mark_dirty(self.floating_text.draw(self.screen, self.camera_x, self.camera_y))
         self.draw_minimap()
         
         self.draw_scores()
@@ -812,69 +625,98 @@ class Game:
         if self.game_over:
             self.draw_game_over()
         
-        pygame.display.flip()
+        self.present()
+    
+    def mark_dirty(self, rects):
+        self.dirty_rects.extend(rects)
+    
+    def mark_hud(self, name, rect, signature):
+        if self.hud_signatures.get(name) != signature:
+            self.hud_signatures[name] = signature
+            self.dirty_rects.append(rect)
+    
+    def present(self):
+        view = (int(self.camera_x), int(self.camera_y), self.game_over)
+        rects = self.dirty_rects
+        self.dirty_rects = []
+        
+        if RENDER_MODE != "dirty" or view != self.last_view:
+            pygame.display.flip()
+        else:
+            screen_rect = self.screen.get_rect()
+            update_rects = [rect.clip(screen_rect) for rect in rects + self.previous_dirty_rects]
+            update_rects = [rect for rect in update_rects if rect.w and rect.h]
+            
+            dirty_area = sum(rect.w * rect.h for rect in update_rects)
+            if dirty_area > DIRTY_RECT_FLIP_RATIO * WINDOW_WIDTH * WINDOW_HEIGHT:
+                pygame.display.flip()
+            elif update_rects:
+                pygame.display.update(update_rects)
+        
+        self.previous_dirty_rects = rects
+        self.last_view = view
     
     def draw_scores(self):
+        signature = []
         if self.player.alive:
             score_text = f"Score: {self.player.score}"
-            text_surface = self.font.render(score_text, True, WHITE)
+            text_surface = render_text(score_text, UI_FONT, SCORE_FONT_SIZE, WHITE)
             self.screen.blit(text_surface, (WINDOW_WIDTH - 150, 20))
             
             time_text = f"Time: {int(self.time_played)}s"
-            time_surface = self.font.render(time_text, True, WHITE)
+            time_surface = render_text(time_text, UI_FONT, SCORE_FONT_SIZE, WHITE)
             self.screen.blit(time_surface, (WINDOW_WIDTH - 150, 50))
+            signature += [score_text, time_text]
         
         alive_ai = [s for s in self.snakes if s != self.player and s.alive]
         top_ai = sorted(alive_ai, key=lambda s: s.score, reverse=True)[:3]
         
         for i, ai in enumerate(top_ai):
             ai_text = f"AI #{i+1}: {ai.score}"
-            text_surface = self.font.render(ai_text, True, ai.color)
+            text_surface = render_text(ai_text, UI_FONT, SCORE_FONT_SIZE, ai.color)
             self.screen.blit(text_surface, (WINDOW_WIDTH - 150, 80 + i * 30))
+            signature.append((ai_text, ai.color))
+        
+        self.mark_hud("scores", pygame.Rect(WINDOW_WIDTH - 150, 20, 150, 150), signature)
     
     def draw_game_over(self):
         overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 180))
         self.screen.blit(overlay, (0, 0))
         
-        game_over_font = pygame.font.SysFont('Arial', 64)
-        text_surface = game_over_font.render("GAME OVER", True, RED)
+        text_surface = render_text("GAME OVER", 'Arial', 64, RED)
         text_rect = text_surface.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//4))
         self.screen.blit(text_surface, text_rect)
         
-        score_font = pygame.font.SysFont('Arial', 36)
-        
         base_score = self.player.score
         base_score_text = f"Base Score: {base_score}"
-        base_score_surface = score_font.render(base_score_text, True, WHITE)
+        base_score_surface = render_text(base_score_text, 'Arial', 36, WHITE)
         base_score_rect = base_score_surface.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//4 + 60))
         self.screen.blit(base_score_surface, base_score_rect)
         
         time_bonus = int(self.time_played * 0.5)
         time_bonus_text = f"Time Bonus: +{time_bonus}"
-        time_bonus_surface = score_font.render(time_bonus_text, True, (100, 255, 100))
+        time_bonus_surface = render_text(time_bonus_text, 'Arial', 36, (100, 255, 100))
         time_bonus_rect = time_bonus_surface.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//4 + 100))
         self.screen.blit(time_bonus_surface, time_bonus_rect)
         
         final_score_text = f"FINAL SCORE: {self.final_score}"
-        final_score_surface = score_font.render(final_score_text, True, YELLOW)
+        final_score_surface = render_text(final_score_text, 'Arial', 36, YELLOW)
         final_score_rect = final_score_surface.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//4 + 150))
         self.screen.blit(final_score_surface, final_score_rect)
         
-        high_score_font = pygame.font.SysFont('Arial', 28)
-        title_surface = high_score_font.render("HIGH SCORES", True, YELLOW)
+        title_surface = render_text("HIGH SCORES", 'Arial', 28, YELLOW)
         title_rect = title_surface.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 + 50))
         self.screen.blit(title_surface, title_rect)
         
         for i, score in enumerate(self.scoreboard[:5]):
             score_text = f"#{i+1}: {score}"
             color = YELLOW if i == 0 else WHITE
-            hs_surface = high_score_font.render(score_text, True, color)
+            hs_surface = render_text(score_text, 'Arial', 28, color)
             hs_rect = hs_surface.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 + 90 + i * 30))
             self.screen.blit(hs_surface, hs_rect)
         
-        restart_font = pygame.font.SysFont('Arial', 24)
-        restart_surface = restart_font.render("Press R to restart", True, WHITE)
+        restart_surface = render_text("Press R to restart", 'Arial', 24, WHITE)
         restart_rect = restart_surface.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT - 80))
         self.screen.blit(restart_surface, restart_rect)
     
@@ -934,12 +776,14 @@ class Game:
                         -math.degrees(angle_to_danger) + 90
                     )
                     
-                    self.screen.blit(
+                    self.mark_dirty([self.screen.blit(
                         rotated_surface,
                         (warning_x - rotated_surface.get_width()//2, warning_y - rotated_surface.get_height()//2)
-                    )
+                    )])
     
     def draw_controls(self):
+        status = None
+        color = None
         if self.player.alive and not self.game_over:
             instructions = [
                 "Move: Mouse",
@@ -948,9 +792,8 @@ class Game:
             ]
             
             text_y = WINDOW_HEIGHT - 80
-            control_font = pygame.font.SysFont('Arial', 16)
             for instruction in instructions:
-                text_surface = control_font.render(instruction, True, (200, 200, 200))
+                text_surface = render_text(instruction, 'Arial', 16, (200, 200, 200))
                 self.screen.blit(text_surface, (20, text_y))
                 text_y += 20
             
@@ -965,28 +808,38 @@ class Game:
                 status = f"Boost: Cooling down..."
                 color = (150, 150, 150)
             
-            status_surface = control_font.render(status, True, color)
+            status_surface = render_text(status, 'Arial', 16, color)
             self.screen.blit(status_surface, (20, WINDOW_HEIGHT - 100))
+        
+        self.mark_hud("controls", pygame.Rect(20, WINDOW_HEIGHT - 100, 240, 80), (status, color))
     
     def draw_snake_stats(self):
         if not self.player.alive:
+            self.mark_hud("stats", pygame.Rect(0, WINDOW_HEIGHT - 30, WINDOW_WIDTH, 30), None)
             return
         
         info_height = 30
         info_surface = pygame.Surface((WINDOW_WIDTH, info_height), pygame.SRCALPHA)
         info_surface.fill((0, 0, 0, 120))
         
-        alive_count = sum(1 for snake in self.snakes if snake.alive)
+        live_count, pooled_count = self.engine.population()
         
-        info_font = pygame.font.SysFont(UI_FONT, 16)
         player_length = len(self.player.segments)
         
-        stats_text = f"Length: {player_length} | Snakes Alive: {alive_count}/{len(self.snakes)} | Food: {len(self.food_manager.foods)}/{MAX_FOOD_ITEMS}"
-        text_surface = info_font.render(stats_text, True, WHITE)
+        stats_text = f"Length: {player_length} | Snakes Alive: {live_count} (pooled {pooled_count}) | Food: {len(self.food_manager.foods)}/{MAX_FOOD_ITEMS}"
+        if DEBUG_MODE:
+            decisions_made, decisions_deferred = self.engine.ai.decision_stats()
+            tier_counts = self.engine.ai.lod_stats()
+            stats_text += f" | AI: {decisions_made} decided, {decisions_deferred} deferred"
+            stats_text += f" | LOD: {tier_counts['near']}/{tier_counts['mid']}/{tier_counts['far']}"
+            stats_text += f" | Seed: {self.engine.seed}"
+        text_surface = render_text(stats_text, UI_FONT, 16, WHITE)
         text_rect = text_surface.get_rect(center=(WINDOW_WIDTH//2, info_height//2))
         
         info_surface.blit(text_surface, text_rect)
         self.screen.blit(info_surface, (0, WINDOW_HEIGHT - info_height))
+        
+        self.mark_hud("stats", pygame.Rect(0, WINDOW_HEIGHT - info_height, WINDOW_WIDTH, info_height), stats_text)
     
     def run(self):
         while self.running:
@@ -1000,4 +853,5 @@ class Game:
                 
             self.clock.tick(FPS)
         
+        self.engine.close()
         pygame.quit()
\ No newline at end of file
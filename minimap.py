@@ -0,0 +1,109 @@
+import pygame
+from config import *
+
+class Minimap:
+    def __init__(self, size=MINIMAP_SIZE, position=MINIMAP_POSITION):
+        self.size = size
+        self.position = position
+        self.scale_x = size / WORLD_WIDTH
+        self.scale_y = size / WORLD_HEIGHT
+        self.update_interval = max(1, FPS // MINIMAP_UPDATE_RATE)
+        
+        self.static_layer = self._build_static_layer()
+        self.dynamic_layer = self.static_layer.copy()
+        self.last_update_tick = None
+        self.dot_stamps = {}
+    
+    def _build_static_layer(self):
+        layer = pygame.Surface((self.size, self.size))
+        layer.fill((0, 0, 0))
+        
+        minimap_bg = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
+        minimap_bg.fill((0, 0, 0, MINIMAP_OPACITY))
+        layer.blit(minimap_bg, (0, 0))
+        
+        grid_spacing = int(40 * self.scale_x)
+        for x in range(0, self.size, grid_spacing):
+            pygame.draw.line(layer, (50, 50, 60), (x, 0), (x, self.size), 1)
+        for y in range(0, self.size, grid_spacing):
+            pygame.draw.line(layer, (50, 50, 60), (0, y), (self.size, y), 1)
+        
+        pygame.draw.rect(layer, MAP_BORDER_COLOR, (0, 0, self.size, self.size), 2)
+        return layer
+    
+    def _dot(self, color, size):
+        key = (color, size)
+        stamp = self.dot_stamps.get(key)
+        if stamp is None:
+            stamp = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
+            pygame.draw.circle(stamp, color, (size, size), size)
+            self.dot_stamps[key] = stamp
+        return stamp
+    
+    def rebuild(self, engine):
+        layer = self.dynamic_layer
+        layer.blit(self.static_layer, (0, 0))
+        
+        scale_x = self.scale_x
+        scale_y = self.scale_y
+        batch = []
+        
+        for cell in engine.food_manager.grid.cells.values():
+            food = next(iter(cell))[0]
+            size = 1 if food.value == 1 else 2
+            map_x = int(food.x * scale_x)
+            map_y = int(food.y * scale_y)
+            batch.append((self._dot(food.color, size), (map_x - size, map_y - size)))
+        
+        heads = []
+        for snake in engine.snakes:
+            if not snake.alive:
+                continue
+            
+            if snake is engine.player:
+                r, g, b = WHITE
+            else:
+                r, g, b = snake.color
+            
+            body_dot = self._dot((r, g, b, 120), 2)
+            for min_x, min_y, max_x, max_y, _ in snake.bounds.chunks.values():
+                map_x = int((min_x + max_x) * 0.5 * scale_x)
+                map_y = int((min_y + max_y) * 0.5 * scale_y)
+                batch.append((body_dot, (map_x - 2, map_y - 2)))
+            
+            head_x, head_y = snake.get_head_position()
+            size = 4 if snake is engine.player else 3
+            heads.append((self._dot((r, g, b, 255), size), (int(head_x * scale_x) - size, int(head_y * scale_y) - size)))
+        
+        layer.blits(batch + heads, doreturn=False)
+        self.last_update_tick = engine.tick
+    
+    def draw(self, surface, engine, camera_x, camera_y):
+        dirty = []
+        last = self.last_update_tick
+        if last is None or engine.tick < last or engine.tick - last >= self.update_interval:
+            self.rebuild(engine)
+            dirty.append(pygame.Rect(self.position, (self.size, self.size)))
+        
+        pos_x, pos_y = self.position
+        border_width = 2
+        border_rect = pygame.Rect(
+            pos_x - border_width,
+            pos_y - border_width,
+            self.size + border_width * 2,
+            self.size + border_width * 2
+        )
+        pygame.draw.rect(surface, (60, 60, 70), border_rect, border_width, border_radius=5)
+        surface.blit(self.dynamic_layer, self.position)
+        
+        view_rect = pygame.Rect(
+            pos_x + int(camera_x * self.scale_x),
+            pos_y + int(camera_y * self.scale_y),
+            int(WINDOW_WIDTH * self.scale_x),
+            int(WINDOW_HEIGHT * self.scale_y)
+        )
+        surface.set_clip(pygame.Rect(self.position, (self.size, self.size)))
+        pygame.draw.rect(surface, WHITE, view_rect, 1)
+        surface.set_clip(None)
+        
+        return dirty
@@ -0,0 +1,152 @@
+import math
+from config import *
+from spatial import SpatialHash
+
+class Neighbour:
+    def __init__(self, snake, x, y, size, heading, is_player, distance):
+        self.snake = snake
+        self.x = x
+        self.y = y
+        self.size = size
+        self.heading = heading
+        self.is_player = is_player
+        self.distance = distance
+
+    def detached(self):
+        return Neighbour(None, self.x, self.y, self.size, self.heading, self.is_player, self.distance)
+
+class FoodPoint:
+    def __init__(self, x, y, value):
+        self.x = x
+        self.y = y
+        self.value = value
+
+class SnakeView:
+    def __init__(self, perception, snake, x, y, size, heading):
+        self.perception = perception
+        self.snake = snake
+        self.x = x
+        self.y = y
+        self.size = size
+        self.heading = heading
+        self._neighbours = None
+        self._food = None
+        self._player = False
+        self.food_target = False
+        self.boost_food = None
+
+    @property
+    def neighbours(self):
+        if self._neighbours is None:
+            self._neighbours = self.perception.neighbours_of(self)
+        return self._neighbours
+
+    @property
+    def player(self):
+        if self._player is False:
+            self._player = self.perception.player_for(self)
+        return self._player
+
+    @property
+    def food(self):
+        if self._food is None:
+            self._food = self.perception.food_manager.query_radius(self.x, self.y, AI_VISION_RANGE)
+        return self._food
+
+    def limit_neighbours(self, count):
+        neighbours = self.neighbours
+        if len(neighbours) > count:
+            nearest = sorted(neighbours, key=lambda neighbour: neighbour.distance)[:count]
+            self._neighbours = [neighbour for neighbour in neighbours if neighbour in nearest]
+
+    def freeze(self):
+        frozen = SnakeView(None, None, self.x, self.y, self.size, self.heading)
+        frozen._neighbours = [neighbour.detached() for neighbour in self.neighbours]
+        frozen._food = [FoodPoint(food.x, food.y, food.value) for food in self.food]
+        player = self.player
+        frozen._player = player.detached() if player is not None else None
+        frozen.food_target = self.food_target
+        return frozen
+
+    def has_food(self):
+        if self.food_target is not False:
+            return self.food_target is not None
+        return bool(self.food)
+
+    def has_boost_food(self):
+        if self.boost_food is not None:
+            return self.boost_food
+        return any(food.value >= AI_BOOST_FOOD_VALUE for food in self.food_within(AI_BOOST_FOOD_RANGE))
+
+    def food_within(self, radius):
+        if radius > AI_VISION_RANGE:
+            return self.perception.food_manager.query_radius(self.x, self.y, radius)
+        radius_sq = radius * radius
+        return [food for food in self.food if (food.x - self.x) ** 2 + (food.y - self.y) ** 2 < radius_sq]
+
+class Perception:
+    def __init__(self, radius=AI_PERCEPTION_RADIUS):
+        self.radius = radius
+        self.heads = SpatialHash(radius)
+        self.records = {}
+        self.views = {}
+        self.player = None
+        self.food_manager = None
+
+    def update(self, snakes, food_manager):
+        self.heads.clear()
+        self.records = {}
+        self.views = {}
+        self.player = None
+        self.food_manager = food_manager
+
+        for index, snake in enumerate(snakes):
+            if not snake.alive:
+                continue
+
+            head_x, head_y = snake.get_head_position()
+            size = len(snake.segments)
+            heading = None
+            if size > 1:
+                second = snake.segments[1]
+                heading = (head_x - second[0], head_y - second[1])
+
+            self.records[snake] = (index, head_x, head_y, size, heading)
+            self.heads.insert(snake, index, head_x, head_y)
+
+            if snake.is_player and self.player is None:
+                self.player = snake
+
+    def view(self, snake):
+        view = self.views.get(snake)
+        if view is None:
+            _, head_x, head_y, size, heading = self.records[snake]
+            view = SnakeView(self, snake, head_x, head_y, size, heading)
+            self.views[snake] = view
+        return view
+
+    def _neighbour(self, view, snake):
+        _, x, y, size, heading = self.records[snake]
+        distance = math.sqrt((view.x - x)**2 + (view.y - y)**2)
+        return Neighbour(snake, x, y, size, heading, snake.is_player, distance)
+
+    def neighbours_of(self, view):
+        found = []
+        for snake, index, x, y in self.heads.query(view.x, view.y, self.radius):
+            if snake is view.snake:
+                continue
+            distance = math.sqrt((view.x - x)**2 + (view.y - y)**2)
+            if distance < self.radius:
+                found.append((index, snake, distance))
+
+        found.sort(key=lambda item: item[0])
+        neighbours = []
+        for index, snake, distance in found:
+            _, x, y, size, heading = self.records[snake]
+            neighbours.append(Neighbour(snake, x, y, size, heading, snake.is_player, distance))
+        return neighbours
+
+    def player_for(self, view):
+        if self.player is None:
+            return None
+        return self._neighbour(view, self.player)
@@ -0,0 +1,119 @@
+from array import array
+from config import *
+
+class SegmentBuffer:
+    def __init__(self, capacity=16):
+        self.capacity = max(1, capacity)
+        self.coords = array('d', bytes(16 * self.capacity))
+        self.start = 0
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        length = self.length
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("segment index out of range")
+        slot = 2 * ((self.start + index) % self.capacity)
+        coords = self.coords
+        return coords[slot], coords[slot + 1]
+
+    def head(self):
+        slot = 2 * self.start
+        return self.coords[slot], self.coords[slot + 1]
+
+    def __iter__(self):
+        coords = self.coords
+        capacity = self.capacity
+        start = self.start
+        for i in range(self.length):
+            slot = 2 * ((start + i) % capacity)
+            yield coords[slot], coords[slot + 1]
+
+    def _grow(self):
+        new_capacity = self.capacity * 2
+        new_coords = array('d', bytes(16 * new_capacity))
+        for i, (x, y) in enumerate(self):
+            new_coords[2 * i] = x
+            new_coords[2 * i + 1] = y
+        self.coords = new_coords
+        self.capacity = new_capacity
+        self.start = 0
+
+    def push_front(self, x, y):
+        if self.length == self.capacity:
+            self._grow()
+        self.start = (self.start - 1) % self.capacity
+        slot = 2 * self.start
+        self.coords[slot] = x
+        self.coords[slot + 1] = y
+        self.length += 1
+
+    def push_back(self, x, y):
+        if self.length == self.capacity:
+            self._grow()
+        slot = 2 * ((self.start + self.length) % self.capacity)
+        self.coords[slot] = x
+        self.coords[slot + 1] = y
+        self.length += 1
+
+    def pop_back(self):
+        if self.length == 0:
+            raise IndexError("pop from empty segment buffer")
+        self.length -= 1
+        slot = 2 * ((self.start + self.length) % self.capacity)
+        return self.coords[slot], self.coords[slot + 1]
+
+    def clear(self):
+        self.start = 0
+        self.length = 0
+
+
+class ChunkBounds:
+    def __init__(self, chunk_size=SEGMENT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.chunks = {}
+
+    def add(self, seq, x, y):
+        key = seq // self.chunk_size
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            self.chunks[key] = [x, y, x, y, 1]
+            return
+        if x < chunk[0]:
+            chunk[0] = x
+        elif x > chunk[2]:
+            chunk[2] = x
+        if y < chunk[1]:
+            chunk[1] = y
+        elif y > chunk[3]:
+            chunk[3] = y
+        chunk[4] += 1
+
+    def remove(self, seq):
+        key = seq // self.chunk_size
+        chunk = self.chunks[key]
+        chunk[4] -= 1
+        if chunk[4] == 0:
+            del self.chunks[key]
+
+    def clear(self):
+        self.chunks.clear()
+
+    def bounds(self):
+        chunks = self.chunks.values()
+        return (
+            min(chunk[0] for chunk in chunks),
+            min(chunk[1] for chunk in chunks),
+            max(chunk[2] for chunk in chunks),
+            max(chunk[3] for chunk in chunks),
+        )
+
+    def query(self, left, top, right, bottom):
+        for key in sorted(self.chunks):
+            min_x, min_y, max_x, max_y, _ = self.chunks[key]
+            if max_x >= left and min_x <= right and max_y >= top and min_y <= bottom:
+                yield key * self.chunk_size, (key + 1) * self.chunk_size - 1
@@ -2,20 +2,148 @@ import pygame
 import math
 import random
 from config import *
+from segments import SegmentBuffer, ChunkBounds
+from fonts import render_text
+
+def compute_segment_color(skin, segment_index):
+    pattern = skin["pattern"]
+    colors = skin["colors"]
+    
+    if not colors:
+        return (0, 255, 0)
+        
+    if pattern == "solid":
+        return colors[0]
+        
+    elif pattern == "rainbow":
+        rainbow_colors = PATTERN_COLORS["rainbow"]
+        group_size = 3
+        color_index = (segment_index // group_size) % len(rainbow_colors)
+        return rainbow_colors[color_index]
+        
+    elif pattern == "gradient":
+        if len(colors) >= 2:
+            color1 = colors[0]
+            color2 = colors[1]
+            
+            fixed_segment_count = 30
+            ratio = min(1.0, segment_index / fixed_segment_count)
+            
+            return (
+                int(color1[0] * (1 - ratio) + color2[0] * ratio),
+                int(color1[1] * (1 - ratio) + color2[1] * ratio),
+                int(color1[2] * (1 - ratio) + color2[2] * ratio)
+            )
+        return colors[0]
+        
+    elif pattern == "tiger":
+        tiger_colors = PATTERN_COLORS["tiger"]
+        return tiger_colors[segment_index % 2]
+        
+    elif pattern == "neon":
+        neon_colors = PATTERN_COLORS["neon"]
+        return neon_colors[segment_index % 2]
+        
+    elif pattern == "lava":
+        lava_colors = PATTERN_COLORS["lava"]
+        
+        if len(lava_colors) >= 3:
+            if segment_index == 0:
+                return lava_colors[0]
+            elif segment_index % 5 == 0:
+                return lava_colors[2]
+            elif segment_index % 3 == 0:
+                return lava_colors[1]
+            else:
+                return lava_colors[0]
+        return colors[0]
+        
+    return colors[0]
+
+
+_segment_stamps = {}
+_glow_sprites = {}
+
+def get_segment_stamp(color, radius, ring=False):
+    key = (color, radius, ring)
+    stamp = _segment_stamps.get(key)
+    if stamp is None:
+        stamp = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
+        pygame.draw.circle(stamp, color, (radius, radius), radius)
+        if ring:
+            darker_color = tuple(max(0, c - 50) for c in color)
+            pygame.draw.circle(stamp, darker_color, (radius, radius), int(radius * 0.7))
+        _segment_stamps[key] = stamp
+    return stamp
+
+def get_glow_sprite(color, glow_radius):
+    key = (color, glow_radius)
+    glow_surface = _glow_sprites.get(key)
+    if glow_surface is None:
+        glow_surface = pygame.Surface((glow_radius*2, glow_radius*2), pygame.SRCALPHA)
+        for r in range(glow_radius, 0, -2):
+            alpha = max(0, int(150 * (r / glow_radius) * (1.0 - r / glow_radius)))
+            glow_color = (*color, alpha)
+            pygame.draw.circle(glow_surface, glow_color, (glow_radius, glow_radius), r)
+        _glow_sprites[key] = glow_surface
+    return glow_surface
+
+class SkinPalette:
+    def __init__(self, skin):
+        self.skin = skin
+        self.colors = []
+        self.unique_colors = {}
+    
+    def __len__(self):
+        return len(self.colors)
+    
+    def __getitem__(self, segment_index):
+        if segment_index >= len(self.colors):
+            self.extend(segment_index + 1)
+        return self.colors[segment_index]
+    
+    def extend(self, length):
+        target = max(length, len(self.colors) * 2, 64)
+        for i in range(len(self.colors), target):
+            color = compute_segment_color(self.skin, i)
+            self.colors.append(self.unique_colors.setdefault(color, color))
+
+
+_skin_palettes = {}
+render_rng = random.Random()
+
+def get_skin_palette(skin_index):
+    palette = _skin_palettes.get(skin_index)
+    if palette is None:
+        palette = SkinPalette(SKINS[skin_index])
+        _skin_palettes[skin_index] = palette
+    return palette
+
 
 class Snake:
-    def __init__(self, x, y, color=None, is_player=False, skin_index=0):
+    def __init__(self, x, y, color=None, is_player=False, skin_index=0, rng=random):
+        self.segments = self._create_segments()
+        self.bounds = ChunkBounds()
+        self.generation = 0
+        self.reset(x, y, color, is_player, skin_index, rng)
+    
+    def reset(self, x, y, color=None, is_player=False, skin_index=0, rng=random):
         self.is_player = is_player
+        self.rng = rng
+        self.generation += 1
         
-        self.skin_index = skin_index if is_player else random.randint(0, len(SKINS)-1)
+        self.skin_index = skin_index if is_player else rng.randint(0, len(SKINS)-1)
         self.skin = SKINS[self.skin_index]
         self.color = color if color else self._get_skin_color()
         
         self.speed = PLAYER_SPEED if is_player else AI_SPEED
-        self.angle = random.uniform(0, 2 * math.pi)
-        self.segments = []
-        self.head_radius = 10
-        self.segment_radius = 8
+        self.angle = rng.uniform(0, 2 * math.pi)
+        self.segments.clear()
+        self.bounds.clear()
+        self.head_radius = HEAD_RADIUS
+        self.segment_radius = SEGMENT_RADIUS
+        self.grid = None
+        self.head_seq = 0
         self.score = 0
         self.alive = True
         self.glow_effect = 0
@@ -31,26 +159,26 @@ class Snake:
         
         self.last_direction_change = 0
         self.collision_immune = False
-        self.collision_immune_time = 0
+        self.collision_immune_ticks = 0
         
         self.color_index = 0
         self.color_cycle_timer = 0
         
-        self.MAX_SEGMENTS = 1000
-        self.segment_colors = {}
-        
-        for i in range(self.MAX_SEGMENTS):
-            self.segment_colors[i] = self._compute_static_color(i)
+        self.palette = get_skin_palette(self.skin_index)
         
         for i in range(INITIAL_SNAKE_LENGTH):
             offset = i * self.segment_radius * 2
-            self.segments.append([
-                x - offset * math.cos(self.angle),
-                y - offset * math.sin(self.angle)
-            ])
+            segment_x = x - offset * math.cos(self.angle)
+            segment_y = y - offset * math.sin(self.angle)
+            self.segments.push_back(segment_x, segment_y)
+            self.bounds.add(-i, segment_x, segment_y)
         
         self.target_angle = self.angle
         self.decision_counter = 0
+        self.deferred_ticks = 0
+    
+    def _create_segments(self):
+        return SegmentBuffer(INITIAL_SNAKE_LENGTH * 4)
     
     def _get_skin_color(self):
         if len(self.skin["colors"]) > 0:
@@ -58,74 +186,14 @@ class Snake:
         return (0, 255, 0)
     
     def _get_segment_color(self, segment_index):
-        if segment_index < self.MAX_SEGMENTS:
-            return self.segment_colors[segment_index]
-        return self.segment_colors[segment_index % self.MAX_SEGMENTS]
-    
-    def _compute_static_color(self, segment_index):
-        pattern = self.skin["pattern"]
-        colors = self.skin["colors"]
-        
-        if not colors:
-            return (0, 255, 0)
-            
-        if pattern == "solid":
-            return colors[0]
-            
-        elif pattern == "rainbow":
-            rainbow_colors = PATTERN_COLORS["rainbow"]
-            group_size = 3
-            color_index = (segment_index // group_size) % len(rainbow_colors)
-            return rainbow_colors[color_index]
-            
-        elif pattern == "gradient":
-            if len(colors) >= 2:
-                color1 = colors[0]
-                color2 = colors[1]
-                
-                fixed_segment_count = 30
-                ratio = min(1.0, segment_index / fixed_segment_count)
-                
-                return (
-                    int(color1[0] * (1 - ratio) + color2[0] * ratio),
-                    int(color1[1] * (1 - ratio) + color2[1] * ratio),
-                    int(color1[2] * (1 - ratio) + color2[2] * ratio)
-                )
-            return colors[0]
-            
-        elif pattern == "tiger":
-            tiger_colors = PATTERN_COLORS["tiger"]
-            return tiger_colors[segment_index % 2]
-            
-        elif pattern == "neon":
-            neon_colors = PATTERN_COLORS["neon"]
-            return neon_colors[segment_index % 2]
-            
-        elif pattern == "lava":
-            lava_colors = PATTERN_COLORS["lava"]
-            
-            if len(lava_colors) >= 3:
-                if segment_index == 0:
-                    return lava_colors[0]
-                elif segment_index % 5 == 0:
-                    return lava_colors[2]
-                elif segment_index % 3 == 0:
-                    return lava_colors[1]
-                else:
-                    return lava_colors[0]
-            return colors[0]
-            
-        return colors[0]
+        return self.palette[segment_index]
     
     def set_skin(self, skin_index):
         if 0 <= skin_index < len(SKINS):
             self.skin_index = skin_index
             self.skin = SKINS[skin_index]
             self.color = self._get_skin_color()
-            
-           
-            for i in range(self.MAX_SEGMENTS):
-                self.segment_colors[i] = self._compute_static_color(i)
+            self.palette = get_skin_palette(skin_index)
             
           
             self.color_index = 0
@@ -137,7 +205,7 @@ class Snake:
         
         if abs(math.sin(old_angle - angle)) > 0.7:
             self.collision_immune = True
-            self.collision_immune_time = pygame.time.get_ticks()
+            self.collision_immune_ticks = COLLISION_IMMUNE_TICKS
     
     def toggle_boost(self, activate):
         if activate:
@@ -164,9 +232,14 @@ class Snake:
         dx = current_speed * math.cos(self.angle)
         dy = current_speed * math.sin(self.angle)
         
-        new_head = [self.segments[0][0] + dx, self.segments[0][1] + dy]
+        head_x, head_y = self.segments.head()
+        new_head = (head_x + dx, head_y + dy)
         
-        self.segments.insert(0, new_head)
+        self.segments.push_front(new_head[0], new_head[1])
+        self.head_seq += 1
+        self.bounds.add(self.head_seq, new_head[0], new_head[1])
+        if self.grid is not None:
+            self.grid.insert(self, self.head_seq, new_head[0], new_head[1])
         
         dropped_segments = []
         score_reduced = False
@@ -179,7 +252,7 @@ class Snake:
             if self.boost_drop_timer >= boost_drop_interval:
                 self.boost_drop_timer = 0
                 
-                dropped_segment = self.segments.pop()
+                dropped_segment = self._pop_tail()
                 dropped_segments.append(dropped_segment)
                 
                 if self.is_player and self.score > 0:
@@ -187,11 +260,11 @@ class Snake:
                     score_reduced = True
                 
                 if len(self.segments) > BOOST_MIN_LENGTH:
-                    self.segments.pop()
+                    self._pop_tail()
             else:
-                self.segments.pop()
+                self._pop_tail()
         else:
-            self.segments.pop()
+            self._pop_tail()
         
         self.trail_counter += 1
         if self.trail_counter >= 2:
@@ -203,18 +276,44 @@ class Snake:
         if self.glow_effect > 0:
             self.glow_effect -= 0.05
         
-        if self.collision_immune and pygame.time.get_ticks() - self.collision_immune_time > 500:
-            self.collision_immune = False
+        if self.collision_immune:
+            self.collision_immune_ticks -= 1
+            if self.collision_immune_ticks < 0:
+                self.collision_immune = False
         
         if self.boost_effect_counter > 0 and not self.boosting:
             self.boost_effect_counter = max(0, self.boost_effect_counter - 0.1)
             
         return dropped_segments, score_reduced
     
+    def _pop_tail(self):
+        tail = self.segments.pop_back()
+        seq = self.head_seq - len(self.segments)
+        self.bounds.remove(seq)
+        if self.grid is not None:
+            self.grid.remove(self, seq, tail[0], tail[1])
+        return tail
+    
+    def attach_grid(self, grid):
+        self.grid = grid
+        for i, segment in enumerate(self.segments):
+            grid.insert(self, self.head_seq - i, segment[0], segment[1])
+    
+    def detach_grid(self):
+        if self.grid is None:
+            return
+        for i, segment in enumerate(self.segments):
+            self.grid.remove(self, self.head_seq - i, segment[0], segment[1])
+        self.grid = None
+    
     def grow(self, amount=1):
         for _ in range(amount):
             last_segment = self.segments[-1]
-            self.segments.append(list(last_segment))
+            seq = self.head_seq - len(self.segments)
+            self.bounds.add(seq, last_segment[0], last_segment[1])
+            if self.grid is not None:
+                self.grid.insert(self, seq, last_segment[0], last_segment[1])
+            self.segments.push_back(last_segment[0], last_segment[1])
             self.score += 1
             
         self.glow_effect = 1.0
@@ -228,42 +327,12 @@ class Snake:
             return True
         return False
     
-    def check_self_collision(self):
-        if not ENABLE_SELF_COLLISION:
-            return False
-        
-        if self.collision_immune:
-            return False
-            
-        if len(self.segments) <= SELF_COLLISION_START_INDEX:
-            return False
-            
-        head = self.segments[0]
-        for i in range(SELF_COLLISION_START_INDEX, len(self.segments)):
-            segment = self.segments[i]
-            distance = math.sqrt((head[0] - segment[0])**2 + (head[1] - segment[1])**2)
-            
-            if distance < (self.head_radius - COLLISION_BUFFER):
-                return True
-        return False
-    
-    def check_snake_collision(self, other_snake):
-        if not self.alive or not other_snake.alive:
-            return False
-            
-        head = self.segments[0]
-        
-        for segment in other_snake.segments:
-            distance = math.sqrt((head[0] - segment[0])**2 + (head[1] - segment[1])**2)
-            if distance < (self.head_radius + other_snake.segment_radius - COLLISION_BUFFER):
-                return True
-        return False
-    
     def die(self):
         if not self.alive:
             return []
             
         self.alive = False
+        self.detach_grid()
         
         dropped_food = []
         
@@ -271,8 +340,8 @@ class Snake:
         
         head_x, head_y = self.segments[0]
         for _ in range(food_count):
-            angle = random.uniform(0, 2 * math.pi)
-            distance = random.uniform(20, 80)
+            angle = self.rng.uniform(0, 2 * math.pi)
+            distance = self.rng.uniform(20, 80)
             food_x = head_x + math.cos(angle) * distance
             food_y = head_y + math.sin(angle) * distance
             
@@ -285,23 +354,26 @@ class Snake:
         if not self.alive:
             return
         
-        in_view = False
-        for segment in self.segments:
-            screen_x = segment[0] - camera_x
-            screen_y = segment[1] - camera_y
-            if (0 <= screen_x <= WINDOW_WIDTH and 0 <= screen_y <= WINDOW_HEIGHT):
-                in_view = True
-                break
+        visible_chunks = list(self.bounds.query(
+            camera_x - 1, camera_y - 1, camera_x + WINDOW_WIDTH + 1, camera_y + WINDOW_HEIGHT + 1
+        ))
         
-        if not in_view:
+        if not visible_chunks:
             return
             
         if self.boosting:
             self._draw_boost_effect(surface, camera_x, camera_y)
         
         segment_count = len(self.segments)
+        patterned = self.skin["pattern"] != "solid"
+        batch = []
+        
+        head_seq = self.head_seq
+        visible_indices = []
+        for first_seq, last_seq in visible_chunks:
+            visible_indices.extend(range(min(segment_count - 1, head_seq - first_seq), max(-1, head_seq - last_seq - 1), -1))
         
-        for i in range(segment_count - 1, -1, -1):
+        for i in visible_indices:
             segment = self.segments[i]
             screen_x = int(segment[0] - camera_x)
             screen_y = int(segment[1] - camera_y)
@@ -309,85 +381,89 @@ class Snake:
             if not (0 <= screen_x <= WINDOW_WIDTH and 0 <= screen_y <= WINDOW_HEIGHT):
                 continue
                 
-            segment_color = self.segment_colors[i]
+            segment_color = self.palette[i]
                 
             if i == 0:
                 radius = self.head_radius
                 if GLOW_INTENSITY > 0:
                     glow_radius = int(radius * 1.5)
-                    glow_surface = pygame.Surface((glow_radius*2, glow_radius*2), pygame.SRCALPHA)
-                    
-                    for r in range(glow_radius, 0, -2):
-                        alpha = max(0, int(150 * (r / glow_radius) * (1.0 - r / glow_radius)))
-                        glow_color = (*segment_color, alpha)
-                        pygame.draw.circle(glow_surface, glow_color, (glow_radius, glow_radius), r)
-                    
-                    surface.blit(glow_surface, (screen_x - glow_radius, screen_y - glow_radius))
+                    glow = get_glow_sprite(segment_color, glow_radius)
+                    batch.append((glow, (screen_x - glow_radius, screen_y - glow_radius)))
             else:
                 factor = 0.85 + 0.15 * min(1.0, i / (segment_count * 0.25))
                 radius = int(self.segment_radius * factor)
             
-            pygame.draw.circle(surface, segment_color, (screen_x, screen_y), radius)
-            
-            if i > 0 and self.skin["pattern"] != "solid" and i % 3 == 0:
-                pattern_radius = int(radius * 0.7)
-                darker_color = tuple(max(0, c - 50) for c in segment_color)
-                pygame.draw.circle(surface, darker_color, (screen_x, screen_y), pattern_radius)
+            stamp = get_segment_stamp(segment_color, radius, patterned and i > 0 and i % 3 == 0)
+            batch.append((stamp, (screen_x - radius, screen_y - radius)))
+        
+        surface.blits(batch, doreturn=False)
         
         self._draw_head_details(surface, camera_x, camera_y)
     
+    def screen_rect(self, camera_x, camera_y):
+        min_x, min_y, max_x, max_y = self.bounds.bounds()
+        margin = 40
+        left = int(min_x - camera_x) - margin
+        top = int(min_y - camera_y) - margin
+        return pygame.Rect(left, top, int(max_x - min_x) + 2 * margin, int(max_y - min_y) + 2 * margin)
+    
     def _draw_boost_effect(self, surface, camera_x, camera_y):
-        head = self.segments[0]
-        screen_head_x = int(head[0] - camera_x)
-        screen_head_y = int(head[1] - camera_y)
+        quality = BOOST_EFFECT_QUALITY
+        if quality <= 0 or len(self.segments) < 2:
+            return
+        
+        num_points = min(BOOST_TRAIL_SEGMENTS, len(self.segments) - 1)
+        stride = max(1, 4 - quality)
+        
+        flame_points = []
+        for i in range(0, num_points, stride):
+            segment = self.segments[i]
+            jitter_x = render_rng.uniform(-2, 2) * (1 - i/num_points)
+            jitter_y = render_rng.uniform(-2, 2) * (1 - i/num_points)
+            flame_points.append((i, segment[0] - camera_x + jitter_x, segment[1] - camera_y + jitter_y))
+        
+        if len(flame_points) < 2:
+            return
+        
+        padding = 12
+        left = int(min(point[1] for point in flame_points)) - padding
+        top = int(min(point[2] for point in flame_points)) - padding
+        right = int(max(point[1] for point in flame_points)) + padding
+        bottom = int(max(point[2] for point in flame_points)) + padding
+        
+        if right < 0 or bottom < 0 or left > WINDOW_WIDTH or top > WINDOW_HEIGHT:
+            return
         
-        boost_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
+        boost_surface = pygame.Surface((right - left, bottom - top), pygame.SRCALPHA)
+        effect_color = self._get_segment_color(0)
         
-        if len(self.segments) > 1:
-            num_points = min(25, len(self.segments) - 1)
+        for (i, x1, y1), (_, x2, y2) in zip(flame_points, flame_points[1:]):
+            effect_width = max(2, int(18 * (1 - i/num_points)))
+            opacity = max(20, int(180 * (1 - i/num_points)))
             
-            flame_points = []
-            for i in range(min(num_points, len(self.segments))):
-                if i >= len(self.segments) - 1:
-                    break
-                    
-                segment = self.segments[i]
-                screen_x = int(segment[0] - camera_x)
-                screen_y = int(segment[1] - camera_y)
-                
-                jitter_x = random.uniform(-2, 2) * (1 - i/num_points)
-                jitter_y = random.uniform(-2, 2) * (1 - i/num_points)
-                
-                flame_points.append((screen_x + jitter_x, screen_y + jitter_y))
-                
-            for i in range(len(flame_points) - 1):
-                effect_width = max(2, int(18 * (1 - i/num_points)))
-                opacity = max(20, int(180 * (1 - i/num_points)))
-                
-                effect_color = self._get_segment_color(0)
-                blend_factor = 1 - i/num_points
-                r = int(255 * blend_factor + effect_color[0] * (1-blend_factor))
-                g = int(215 * blend_factor + effect_color[1] * (1-blend_factor))
-                b = int(120 * blend_factor + effect_color[2] * (1-blend_factor))
-                
-                pygame.draw.line(
+            blend_factor = 1 - i/num_points
+            r = int(255 * blend_factor + effect_color[0] * (1-blend_factor))
+            g = int(215 * blend_factor + effect_color[1] * (1-blend_factor))
+            b = int(120 * blend_factor + effect_color[2] * (1-blend_factor))
+            
+            pygame.draw.line(
+                boost_surface,
+                (r, g, b, opacity),
+                (x1 - left, y1 - top),
+                (x2 - left, y2 - top),
+                effect_width
+            )
+            
+            if quality >= 2 and i % 2 == 0 and i > 5:
+                particle_size = max(1, int(3 * (1 - i/num_points)))
+                pygame.draw.circle(
                     boost_surface,
-                    (r, g, b, opacity),
-                    flame_points[i],
-                    flame_points[i+1],
-                    effect_width
+                    (r, g, b, opacity//2),
+                    (x1 - left, y1 - top),
+                    particle_size
                 )
-                
-                if i % 2 == 0 and i > 5:
-                    particle_size = max(1, int(3 * (1 - i/num_points)))
-                    pygame.draw.circle(
-                        boost_surface,
-                        (r, g, b, opacity//2),
-                        flame_points[i],
-                        particle_size
-                    )
         
-        surface.blit(boost_surface, (0, 0))
+        surface.blit(boost_surface, (left, top))
     
     def _draw_head_details(self, surface, camera_x, camera_y):
         head = self.segments[0]
@@ -421,9 +497,8 @@ class Snake:
         pygame.draw.circle(surface, pupil_color, (int(pupil2_x), int(pupil2_y)), pupil_radius)
         
         if len(self.segments) > 5:
-            font = pygame.font.SysFont(UI_FONT, 14)
             text = str(self.score) if not self.is_player else "You: " + str(self.score)
-            text_surface = font.render(text, True, WHITE)
+            text_surface = render_text(text, UI_FONT, 14, WHITE)
             text_rect = text_surface.get_rect(center=(screen_head_x, screen_head_y - 25))
             surface.blit(text_surface, text_rect)
         
@@ -483,7 +558,7 @@ class Snake:
                 )
     
     def get_head_position(self):
-        return self.segments[0]
+        return self.segments.head()
     
     def get_boost_status(self):
         can_boost = len(self.segments) > BOOST_MIN_LENGTH and self.boost_cooldown <= 0
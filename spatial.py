@@ -0,0 +1,54 @@
+class SpatialHash:
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def cell_of(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, owner, key, x, y):
+        cell_key = self.cell_of(x, y)
+        cell = self.cells.get(cell_key)
+        if cell is None:
+            cell = {}
+            self.cells[cell_key] = cell
+        cell[(owner, key)] = (x, y)
+
+    def insert_in_cell(self, cell_key, owner, key, x, y):
+        cell = self.cells.get(cell_key)
+        if cell is None:
+            cell = {}
+            self.cells[cell_key] = cell
+        cell[(owner, key)] = (x, y)
+
+    def remove(self, owner, key, x, y):
+        cell_key = self.cell_of(x, y)
+        cell = self.cells.get(cell_key)
+        if cell is None:
+            return
+        cell.pop((owner, key), None)
+        if not cell:
+            del self.cells[cell_key]
+
+    def remove_from_cell(self, cell_key, owner, key):
+        cell = self.cells.get(cell_key)
+        if cell is None:
+            return
+        cell.pop((owner, key), None)
+        if not cell:
+            del self.cells[cell_key]
+
+    def query(self, x, y, radius):
+        min_cx, min_cy = self.cell_of(x - radius, y - radius)
+        max_cx, max_cy = self.cell_of(x + radius, y + radius)
+
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is None:
+                    continue
+                for (owner, key), (px, py) in cell.items():
+                    yield owner, key, px, py
+
+    def clear(self):
+        self.cells.clear()
@@ -0,0 +1,294 @@
+import random
+from config import *
+from snake import Snake
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+VECTORIZE_AVAILABLE = np is not None
+
+
+class SnakeArrays:
+    FIELDS = (
+        ("speed", "f8", float),
+        ("boost_drop_timer", "i8", int),
+        ("boost_effect_counter", "f8", float),
+        ("glow_effect", "f8", float),
+        ("collision_immune_ticks", "i8", int),
+        ("trail_counter", "i8", int),
+    )
+
+    def __init__(self, slot_capacity=64, segment_capacity=64):
+        self.slot_capacity = slot_capacity
+        self.segment_capacity = segment_capacity
+        self.count = 0
+        self.snakes = []
+
+        for name, dtype, _ in self.FIELDS:
+            setattr(self, name, np.zeros(slot_capacity, dtype=dtype))
+        self.start = np.zeros(slot_capacity, dtype="i8")
+        self.length = np.zeros(slot_capacity, dtype="i8")
+        self.coords = np.zeros((slot_capacity, segment_capacity, 2))
+
+    def allocate(self, snake):
+        if self.count == self.slot_capacity:
+            self._grow_slots()
+        slot = self.count
+        self.count += 1
+        self.snakes.append(snake)
+        self.start[slot] = 0
+        self.length[slot] = 0
+        return slot
+
+    def _grow_slots(self):
+        extra = self.slot_capacity
+        for name, dtype, _ in self.FIELDS:
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros(extra, dtype=dtype)]))
+        self.start = np.concatenate([self.start, np.zeros(extra, dtype="i8")])
+        self.length = np.concatenate([self.length, np.zeros(extra, dtype="i8")])
+        self.coords = np.concatenate([self.coords, np.zeros((extra, self.segment_capacity, 2))])
+        self.slot_capacity += extra
+
+    def ensure_segment_capacity(self, length):
+        if length <= self.segment_capacity:
+            return
+        capacity = self.segment_capacity
+        new_capacity = capacity
+        while new_capacity < length:
+            new_capacity *= 2
+
+        rows = np.arange(self.slot_capacity)[:, None]
+        columns = (self.start[:, None] + np.arange(capacity)) % capacity
+        coords = np.zeros((self.slot_capacity, new_capacity, 2))
+        coords[:, :capacity] = self.coords[rows, columns]
+
+        self.coords = coords
+        self.segment_capacity = new_capacity
+        self.start[:] = 0
+
+    def ordered_segments(self, slot):
+        length = self.length[slot]
+        indices = (self.start[slot] + np.arange(length)) % self.segment_capacity
+        return self.coords[slot, indices]
+
+    def step(self, snakes, grid):
+        # angle, boosting, boost_cooldown, collision_immune and head_seq stay
+        # plain attributes because the AI and collision code read them many
+        # times per tick; they are gathered here once and written back below.
+        live = [snake for snake in snakes if snake.alive]
+        if not live:
+            return []
+        count = len(live)
+
+        slots = np.fromiter((snake.slot for snake in live), "i8", count)
+        angle = np.fromiter((snake.angle for snake in live), "f8", count)
+        boosting = np.fromiter((snake.boosting for snake in live), "?", count)
+        cooldown = np.fromiter((snake.boost_cooldown for snake in live), "f8", count)
+        immune = np.fromiter((snake.collision_immune for snake in live), "?", count)
+        head_seq = np.fromiter((snake.head_seq for snake in live), "i8", count) + 1
+
+        length = self.length[slots]
+        self.ensure_segment_capacity(int(length.max()) + 1)
+        capacity = self.segment_capacity
+
+        cooldown = np.where(cooldown > 0, cooldown - 1, cooldown)
+
+        speed = self.speed[slots] * np.where(boosting, BOOST_SPEED_MULTIPLIER, 1.0)
+
+        start = self.start[slots]
+        head_x = self.coords[slots, start, 0] + speed * np.cos(angle)
+        head_y = self.coords[slots, start, 1] + speed * np.sin(angle)
+
+        start = (start - 1) % capacity
+        self.start[slots] = start
+        self.coords[slots, start, 0] = head_x
+        self.coords[slots, start, 1] = head_y
+        length += 1
+
+        boost_path = boosting & (length > BOOST_MIN_LENGTH)
+        timer = self.boost_drop_timer[slots] + boost_path
+        drop = boost_path & (timer >= BOOST_SEGMENT_DROP_INTERVAL)
+        timer[drop] = 0
+        self.boost_drop_timer[slots] = timer
+
+        length -= 1
+        tail1 = self.coords[slots, (start + length) % capacity]
+        seq1 = head_seq - length
+
+        second = drop & (length > BOOST_MIN_LENGTH)
+        length -= second
+        tail2 = self.coords[slots, (start + length) % capacity]
+        seq2 = head_seq - length
+
+        self.length[slots] = length
+
+        trail_counter = self.trail_counter[slots] + 1
+        trail_hit = trail_counter >= 2
+        trail_counter[trail_hit] = 0
+        self.trail_counter[slots] = trail_counter
+
+        glow = self.glow_effect[slots]
+        self.glow_effect[slots] = np.where(glow > 0, glow - 0.05, glow)
+
+        immune_ticks = self.collision_immune_ticks[slots]
+        immune_ticks = np.where(immune, immune_ticks - 1, immune_ticks)
+        self.collision_immune_ticks[slots] = immune_ticks
+        immune &= immune_ticks >= 0
+
+        effect = self.boost_effect_counter[slots]
+        self.boost_effect_counter[slots] = np.where(
+            (effect > 0) & ~boosting, np.maximum(0, effect - 0.1), effect
+        )
+
+        if grid is not None:
+            cell_size = grid.cell_size
+            head_cells = zip((head_x // cell_size).astype("i8").tolist(), (head_y // cell_size).astype("i8").tolist())
+            tail1_cells = zip(*(tail1 // cell_size).astype("i8").T.tolist())
+            tail2_cells = zip(*(tail2 // cell_size).astype("i8").T.tolist())
+        else:
+            head_cells = tail1_cells = tail2_cells = [None] * count
+
+        results = []
+        rows = zip(
+            live, head_x.tolist(), head_y.tolist(), head_seq.tolist(), cooldown.tolist(), immune.tolist(),
+            tail1.tolist(), seq1.tolist(), tail2.tolist(), seq2.tolist(),
+            drop.tolist(), second.tolist(), trail_hit.tolist(), head_cells, tail1_cells, tail2_cells
+        )
+        for (snake, x, y, seq, snake_cooldown, snake_immune, t1, s1, t2, s2,
+             dropped, popped_twice, add_trail, head_cell, tail1_cell, tail2_cell) in rows:
+            snake.head_seq = seq
+            snake.boost_cooldown = snake_cooldown
+            snake.collision_immune = snake_immune
+
+            segments = snake.segments
+            segments.neck_position = segments.head_position
+            segments.head_position = (x, y)
+            bounds = snake.bounds
+            bounds.add(seq, x, y)
+            bounds.remove(s1)
+            if popped_twice:
+                segments.length -= 1
+                bounds.remove(s2)
+
+            if head_cell is not None:
+                grid.insert_in_cell(head_cell, snake, seq, x, y)
+                grid.remove_from_cell(tail1_cell, snake, s1)
+                if popped_twice:
+                    grid.remove_from_cell(tail2_cell, snake, s2)
+
+            if add_trail:
+                if len(snake.trail) >= snake.trail_length:
+                    snake.trail.pop()
+                snake.trail.insert(0, [x, y])
+
+            if dropped:
+                score_reduced = False
+                if snake.is_player and snake.score > 0:
+                    snake.score -= 1
+                    score_reduced = True
+                results.append((snake, [tuple(t1)], score_reduced))
+
+        return results
+
+
+class _ArrayField:
+    def __init__(self, name, cast):
+        self.name = name
+        self.cast = cast
+
+    def __get__(self, snake, owner=None):
+        if snake is None:
+            return self
+        return self.cast(getattr(snake.world, self.name)[snake.slot])
+
+    def __set__(self, snake, value):
+        getattr(snake.world, self.name)[snake.slot] = value
+
+
+class ArraySegments:
+    def __init__(self, world, slot):
+        self.world = world
+        self.slot = slot
+        self.length = 0
+        self.head_position = None
+        self.neck_position = None
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        length = self.length
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("segment index out of range")
+        if index == 0:
+            return self.head_position
+        if index == 1:
+            return self.neck_position
+        world = self.world
+        x, y = world.coords[self.slot, (world.start[self.slot] + index) % world.segment_capacity]
+        return float(x), float(y)
+
+    def __iter__(self):
+        for x, y in self.world.ordered_segments(self.slot).tolist():
+            yield x, y
+
+    def head(self):
+        return self.head_position
+
+    def push_front(self, x, y):
+        world = self.world
+        slot = self.slot
+        world.ensure_segment_capacity(self.length + 1)
+        start = (world.start[slot] - 1) % world.segment_capacity
+        world.start[slot] = start
+        world.coords[slot, start] = (x, y)
+        self.length += 1
+        world.length[slot] = self.length
+        self.neck_position = self.head_position
+        self.head_position = (x, y)
+
+    def push_back(self, x, y):
+        world = self.world
+        slot = self.slot
+        world.ensure_segment_capacity(self.length + 1)
+        index = (world.start[slot] + self.length) % world.segment_capacity
+        world.coords[slot, index] = (x, y)
+        self.length += 1
+        world.length[slot] = self.length
+        if self.length == 1:
+            self.head_position = (x, y)
+        elif self.length == 2:
+            self.neck_position = (x, y)
+
+    def pop_back(self):
+        if self.length == 0:
+            raise IndexError("pop from empty segment buffer")
+        tail = self[-1]
+        self.length -= 1
+        self.world.length[self.slot] = self.length
+        return tail
+
+    def clear(self):
+        self.world.start[self.slot] = 0
+        self.world.length[self.slot] = 0
+        self.length = 0
+        self.head_position = None
+        self.neck_position = None
+
+
+class ArraySnake(Snake):
+    def __init__(self, world, x, y, color=None, is_player=False, skin_index=0, rng=random):
+        self.world = world
+        self.slot = world.allocate(self)
+        super().__init__(x, y, color, is_player, skin_index, rng)
+
+    def _create_segments(self):
+        return ArraySegments(self.world, self.slot)
+
+
+for _name, _, _cast in SnakeArrays.FIELDS:
+    setattr(ArraySnake, _name, _ArrayField(_name, _cast))